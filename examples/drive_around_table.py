@@ -12,11 +12,10 @@ from jaraco.nxt.messages import (
     SetOutputState,
     OutputPort,
     ResetMotorPosition,
-    GetOutputState,
     RunState,
     RegulationMode,
 )
-import time
+from jaraco.nxt.routine import await_motion
 
 # Constants
 table_length = 2850  # in degrees of motor rotations :-)
@@ -37,18 +36,6 @@ def initialize():
         connection.send(ResetMotorPosition(port))
 
 
-# todo - port this to the library
-def wait_for_motor(conn, port):
-    cmd = GetOutputState(port)
-    status = RunState.running
-    while status == RunState.running:
-        conn.send(cmd)
-        status = conn.receive().run_state
-        print('run_state is', status)
-        time.sleep(0.1)
-    print('exiting wait for motor')
-
-
 def run():
     # Start the engines, main loop begins (repeated 4 times)
     # 4 times because we got 4 equal sides of the table :-)
@@ -76,17 +63,12 @@ def run():
                 turn_ratio=0,  # straight ahead
             ),
         ]
-        list(map(connection.send, cmds))
-
-        # let the robot start:
-        time.sleep(1)
+        with connection.coalesce():
+            list(map(connection.send, cmds))
 
-        # Check for the end end of table
-        wait_for_motor(connection, OutputPort.b)
-
-        # give it a little time to correct its mistakes (hey synchronisation
-        # mode :-)
-        time.sleep(2)
+        # Check for the end end of table (once both synchronised motors
+        #  have stopped, so they've had time to correct their mistakes)
+        await_motion(connection, [OutputPort.b, OutputPort.c])
 
         # apparently we've stopped!
         # then release the motors
@@ -119,17 +101,11 @@ def run():
             ),
         ]
 
-        list(map(connection.send, cmds))
-
-        # leave the bot time to start turning
-        time.sleep(1)
+        with connection.coalesce():
+            list(map(connection.send, cmds))
 
         # Check for the end of rotation
-        wait_for_motor(connection, OutputPort.b)
-
-        # give it a little time to correct its mistakes (hey synchronisation
-        # mode :-)
-        time.sleep(2)
+        await_motion(connection, [OutputPort.b, OutputPort.c])
 
         # apparently we've stopped!
         # then release the motors
@@ -42,8 +42,7 @@ def query_status(dev, port):
     """
 
     # query for the input values and re-write the line
-    dev.send(messages.GetInputValues(port))
-    input_res = dev.receive()
+    input_res = dev.request(messages.GetInputValues(port))
     # print each of the fields
     values = ', '.join('%4d' % getattr(input_res, field) for field in input_res.fields)
     # carriage return but no line feed so we write over the previous line
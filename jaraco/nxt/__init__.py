@@ -7,12 +7,20 @@ products.
 Requires a bluetooth connection (and utilizes serial protocol).
 """
 
-import traceback
+import contextlib
+import functools
+import itertools
 import logging
+import time
+import traceback
+from concurrent import futures
 
 import serial
 
 from jaraco.nxt import messages
+from jaraco.nxt.cache import BrickCache
+from jaraco.nxt.coalesce import CoalescingWriter
+from jaraco.nxt.metrics import Instrument
 
 try:
     import bluetooth
@@ -31,13 +39,141 @@ def add_arguments(parser):
 
 
 class Device:
+    chunk_size = 0
+    """
+    The number of bytes to request in each read. Zero requests only as
+    many bytes as are needed to complete a message, suitable for
+    streams whose reads block until the requested count is available.
+    """
+
+    _writer = None
+
+    metrics = None
+    "An Instrument reporting on messages sent and received, if any"
+
     def receive(self):
         'Receive a message from the NXT'
-        return messages.Message.read(self)
+        if self._writer is not None:
+            # the message being awaited may depend on those still buffered
+            self._writer.flush()
+        if self.metrics is not None:
+            return self._receive_measured()
+        return self._decoder.read(self, self.chunk_size)
+
+    def _receive_measured(self):
+        start = time.perf_counter()
+        try:
+            self._decoder.fill(self, self.chunk_size)
+            filled = time.perf_counter()
+            message = next(self._decoder.messages())
+        except Exception as exc:
+            self.metrics.error(exc)
+            raise
+        decoded = time.perf_counter()
+        self.metrics.received(message, filled - start, decoded - filled)
+        return message
+
+    @functools.cached_property
+    def _decoder(self):
+        return messages.FrameDecoder()
+
+    def request(self, command):
+        """
+        Send command and return its reply (or None if the command
+        solicits no reply).
+        """
+        return self.request_many([command])[0]
+
+    def request_many(self, commands):
+        """
+        Send commands back-to-back, then receive their replies,
+        saving a round trip per command over sending each and
+        waiting for its reply.
+
+        Return a list of the replies in order, with None for each
+        command that solicits no reply.
+        """
+        commands = list(commands)
+        for command in commands:
+            self.send(command)
+        return [
+            self.receive() if command.expected_reply else None for command in commands
+        ]
 
     def send(self, message):
         "Send a message to the NXT"
-        self.write(str(message))
+        if self.metrics is not None:
+            return self._send_measured(message)
+        self._send(message)
+
+    def _send(self, message):
+        "Send the message, returning the number of bytes sent"
+        if self._writer is not None:
+            return self._writer.send(message)
+        buffer = self._send_buffer
+        size = message.encode_into(buffer.obj)
+        self.write(buffer[:size])
+        return size
+
+    def _send_measured(self, message):
+        try:
+            size = self._send(message)
+        except Exception as exc:
+            self.metrics.error(exc)
+            raise
+        self.metrics.sent(message, size)
+
+    def write_frames(self, data):
+        """
+        Send data, messages already encoded (as by bytes(message)),
+        after any messages still to be written by the writer.
+        """
+        if self._writer is not None:
+            self._writer.flush()
+        try:
+            self.write(data)
+        except Exception as exc:
+            if self.metrics is not None:
+                self.metrics.error(exc)
+            raise
+        if self.metrics is not None:
+            self.metrics.sent_frames(data)
+
+    @functools.cached_property
+    def _send_buffer(self):
+        """
+        A buffer, reused for each message sent, into which the message
+        is encoded.
+        """
+        return memoryview(bytearray(messages.Message.max_payload + 2))
+
+    def coalesce(self, threshold=256, latency=0.002):
+        """
+        Coalesce subsequent messages sent into fewer writes (see
+        CoalescingWriter). Returns the writer, which may be used as a
+        context manager to flush and stop coalescing on exit.
+
+        >>> writes = []
+        >>> dev = Device()
+        >>> dev.write = writes.append
+        >>> with dev.coalesce():
+        ...     dev.send(messages.SetOutputState(messages.OutputPort.b))
+        ...     dev.send(messages.SetOutputState(messages.OutputPort.c))
+        >>> len(writes)
+        1
+        """
+        if self._writer is not None:
+            self._writer.close()
+        self._writer = CoalescingWriter(self, threshold, latency)
+        return self._writer
+
+    def instrument(self, sink):
+        """
+        Report the messages sent and received to sink (see
+        jaraco.nxt.metrics). Returns the Instrument.
+        """
+        self.metrics = Instrument(sink)
+        return self.metrics
 
 
 class Connection(serial.Serial, Device):
@@ -51,12 +187,30 @@ class Connection(serial.Serial, Device):
     conn = Connection('COM3')
     """
 
+    transport = 'serial'
+
+    @property
+    def address(self):
+        return self.port
+
+    def set_timeout(self, timeout):
+        "Set the timeout (in seconds, or None to block) for reads"
+        self.timeout = timeout
+
 
 class BluetoothDevice(Device, bluetooth.BluetoothSocket):
     port = 1
+    chunk_size = 1024
+    transport = 'bluetooth'
 
-    def __init__(self, host):
+    def __init__(self, host, timeout=None):
+        """
+        Connect to the NXT at the host address, waiting at most
+        timeout seconds (which then applies to reads).
+        """
         bluetooth.BluetoothSocket.__init__(self, bluetooth.RFCOMM)
+        self.address = host
+        self.set_timeout(timeout)
         hp = (host, self.port)
         self.connect(hp)
 
@@ -66,13 +220,62 @@ class BluetoothDevice(Device, bluetooth.BluetoothSocket):
     def write(self, bytes):
         bluetooth.BluetoothSocket.send(self, bytes)
 
+    @property
+    def rfcomm_port(self):
+        return self.port
+
+    def set_timeout(self, timeout):
+        "Set the timeout (in seconds, or None to block) for reads"
+        self.settimeout(timeout)
+
+
+class SocketDevice(Device):
+    """
+    A device communicating over a connected socket (such as a TCP
+    bridge to the brick or a simulator).
+    """
+
+    chunk_size = 1024
+
+    def __init__(self, sock):
+        self.socket = sock
+
+    def read(self, nbytes):
+        return self.socket.recv(nbytes)
+
+    def write(self, data):
+        self.socket.sendall(data)
+
+    def set_timeout(self, timeout):
+        "Set the timeout (in seconds, or None to block) for reads"
+        self.socket.settimeout(timeout)
+
+    def close(self):
+        self.socket.close()
+
 
 class DeviceNotFoundException(Exception):
     pass
 
 
 class Locator:
+    cache = None
+    "A BrickCache of bricks to try before discovering candidates"
+
+    connect_timeout = 2
+    "Seconds to wait for each Bluetooth connection"
+
+    reply_timeout = 0.5
+    "Seconds to wait for each candidate to reply to the probe"
+
+    def __init__(self, cache=None):
+        if cache is not None:
+            self.cache = cache
+
     def find_brick(self):
+        brick = self.find_cached_brick()
+        if brick:
+            return brick
         try:
             return next(self.find_bricks())
         except StopIteration:
@@ -87,21 +290,161 @@ class Locator:
                 traceback.print_exc()
             except IOError:
                 pass
+            else:
+                self.remember(candidate)
             yield candidate
 
+    def find_cached_brick(self):
+        """
+        Return the first cached brick to respond, forgetting those
+        that don't, or None if none respond.
+        """
+        if self.cache is None:
+            return None
+        for entry in self.cache.entries():
+            opener = functools.partial(self._open_entry, entry)
+            try:
+                brick = self.probe(opener)
+            except Exception as exc:
+                log.debug('Cached brick %s failed: %s', entry['address'], exc)
+                self.cache.forget(entry)
+                continue
+            self.cache.remember(entry)
+            return brick
+        return None
+
+    def remember(self, brick):
+        "Record the brick in the cache, if any"
+        if self.cache is not None:
+            self.cache.remember(self.cache.entry_for(brick))
+
+    def probe(self, opener):
+        "Open the candidate and return it if it responds as a brick"
+        candidate = opener()
+        try:
+            candidate.set_timeout(self.reply_timeout)
+            candidate.request(messages.GetBatteryLevel())
+            candidate.set_timeout(None)
+        except BaseException:
+            self._close(candidate)
+            raise
+        return candidate
+
+    @staticmethod
+    def _close(device):
+        with contextlib.suppress(Exception):
+            device.close()
+
+    def _open_entry(self, entry):
+        if entry['transport'] == 'bluetooth':
+            return self._open_bluetooth(
+                entry['address'], entry['name'], self.connect_timeout
+            )
+        return self._open_serial(entry['address'], self.reply_timeout)
+
     def find_candidates(self):
-        for host, name in bluetooth.discover_devices(lookup_names=True):
-            log.debug('Attempting to connect to bluetooth host %s (%s)', host, name)
+        openers = itertools.chain(self.bluetooth_openers(), self.serial_openers())
+        for open_candidate in openers:
             try:
-                yield BluetoothDevice(host)
+                yield open_candidate()
             except IOError:
                 pass
+
+    def bluetooth_openers(self, timeout=None):
+        """
+        Generate a function opening each Bluetooth device discovered
+        (waiting at most timeout seconds to connect).
+        """
+        for host, name in bluetooth.discover_devices(lookup_names=True):
+            yield functools.partial(self._open_bluetooth, host, name, timeout)
+
+    @staticmethod
+    def _open_bluetooth(host, name, timeout):
+        log.debug('Attempting to connect to bluetooth host %s (%s)', host, name)
+        device = BluetoothDevice(host, timeout=timeout)
+        device.name = name
+        return device
+
+    def serial_openers(self, timeout=None):
+        """
+        Generate a function opening each serial port (whose reads
+        wait at most timeout seconds).
+        """
         for serial_port in range(10):
-            log.debug('Attempting to connect to serial port %d', serial_port)
-            try:
-                yield Connection(serial_port, writeTimeout=1)
-            except serial.SerialException:
-                pass
+            yield functools.partial(self._open_serial, serial_port, timeout)
+
+    @staticmethod
+    def _open_serial(serial_port, timeout):
+        log.debug('Attempting to connect to serial port %s', serial_port)
+        return Connection(serial_port, writeTimeout=1, timeout=timeout)
+
+
+class ConcurrentLocator(Locator):
+    """
+    A Locator that probes all candidates at once, each in its own
+    thread, returning the first brick to respond and closing the
+    rest.
+    """
+
+    max_workers = 16
+
+    def find_brick(self, timeout=None):
+        """
+        Find a brick, trying cached bricks first, then waiting at most
+        timeout seconds for a discovered one to respond.
+        """
+        brick = self.find_cached_brick()
+        if brick:
+            return brick
+        pool = futures.ThreadPoolExecutor(self.max_workers)
+        discovery = pool.submit(list, self.bluetooth_openers(self.connect_timeout))
+        pending = {discovery} | {
+            pool.submit(self.probe, opener)
+            for opener in self.serial_openers(self.reply_timeout)
+        }
+        deadline = timeout and time.monotonic() + timeout
+        try:
+            while pending:
+                remaining = deadline and max(deadline - time.monotonic(), 0)
+                done, pending = futures.wait(
+                    pending, remaining, return_when=futures.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                if discovery in done:
+                    done.remove(discovery)
+                    pending |= {
+                        pool.submit(self.probe, opener)
+                        for opener in self._result(discovery, ())
+                    }
+                found = list(filter(None, map(self._result, done)))
+                if found:
+                    brick, *others = found
+                    list(map(self._close, others))
+                    self.remember(brick)
+                    return brick
+        finally:
+            for future in pending:
+                future.add_done_callback(self._close_result)
+            pool.shutdown(wait=False, cancel_futures=True)
+        raise DeviceNotFoundException()
+
+    @staticmethod
+    def _result(future, default=None):
+        "Return the result of the future, logging any failure"
+        try:
+            return future.result()
+        except Exception as exc:
+            log.debug('Candidate failed: %s', exc)
+            return default
+
+    @classmethod
+    def _close_result(cls, future):
+        "Close any device opened after a brick was already found"
+        if not future.cancelled() and not future.exception():
+            result = future.result()
+            if isinstance(result, Device):
+                cls._close(result)
 
 
-locator = Locator()
+locator = ConcurrentLocator(BrickCache())
@@ -17,24 +17,45 @@ True
 You can retrieve the enumerated values as a dictionary also:
 >>> MyEnum.dictionary() == {'x': 1, 'y': 2, 'z': 40}
 True
+
+Values may be tested for membership and named in constant time:
+>>> 40 in MyEnum.values()
+True
+>>> MyEnum.name_of(2)
+'y'
 """
 
 
 class SpecEnum:
+    def __init_subclass__(cls, **kwargs):
+        "Compute the lookup tables once for each enum"
+        super().__init_subclass__(**kwargs)
+        items = cls.__dict__.items()
+        cls._members = {key: value for (key, value) in items if not key.startswith('_')}
+        cls._values = frozenset(cls._members.values())
+        cls._names = {}
+        for key, value in cls._members.items():
+            # where values are aliased, the first name prevails
+            cls._names.setdefault(value, key)
+
     @classmethod
     def dictionary(cls):
         "Return all of the class attributes that do not begin with _"
-        items = cls.__dict__.items()
-        pub_items = ((key, value) for (key, value) in items if not key.startswith('_'))
-        return dict(pub_items)
+        return dict(cls._members)
 
     @classmethod
     def keys(cls):
-        return cls.dictionary().keys()
+        return cls._members.keys()
 
     @classmethod
     def values(cls):
-        return cls.dictionary().values()
+        "The set of values"
+        return cls._values
+
+    @classmethod
+    def name_of(cls, value, default=None):
+        "The name of value (or default if it has none)"
+        return cls._names.get(value, default)
 
 
 class CommandTypes(SpecEnum):
@@ -131,14 +152,31 @@ class InputPort(int):
     Traceback (most recent call last):
     ...
     AssertionError: InputPort must be between 1 and 4
+
+    There is but one instance of each port.
+
+    >>> InputPort(1) is port1
+    True
     """
 
+    __slots__ = ()
+
+    _ports: 'dict[int, InputPort]' = {}
+
     def __new__(cls, val):
-        adjusted_val = val if isinstance(val, InputPort) else val - 1
-        assert 0 <= adjusted_val <= 3, "InputPort must be between 1 and 4"
-        return int.__new__(cls, adjusted_val)
+        if isinstance(val, InputPort):
+            return val
+        try:
+            return cls._ports[val]
+        except KeyError:
+            raise AssertionError("InputPort must be between 1 and 4") from None
 
     def __repr__(self):
         class_name = self.__class__.__name__
         val_1 = self + 1
         return '%(class_name)s(%(val_1)s)' % locals()
+
+
+InputPort._ports.update(
+    (number, int.__new__(InputPort, number - 1)) for number in range(1, 5)
+)
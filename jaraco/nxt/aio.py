@@ -0,0 +1,122 @@
+"""
+asyncio support for communicating with the NXT.
+
+Unlike the blocking ``Device``, an ``AsyncDevice`` permits many
+requests to be outstanding at once, so a request need not wait for
+the reply to the previous one before being sent.
+"""
+
+import asyncio
+import collections
+import contextlib
+import logging
+import socket
+
+from . import BluetoothDevice, messages
+
+log = logging.getLogger(__name__)
+
+
+class AsyncDevice(asyncio.Protocol):
+    """
+    An asyncio protocol speaking to an NXT brick.
+
+    Replies are matched to requests by command byte, in the order
+    the requests were sent.
+    """
+
+    def __init__(self):
+        self.transport = None
+        self._decoder = messages.FrameDecoder()
+        self._pending = collections.defaultdict(collections.deque)
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        for message in self._decoder.feed(data):
+            self._dispatch(message)
+
+    def connection_lost(self, exc):
+        exc = exc or ConnectionError("Connection to the NXT was lost")
+        for waiters in self._pending.values():
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(exc)
+        self._pending.clear()
+
+    def _dispatch(self, message):
+        command = message.payload[1]
+        waiters = self._pending.get(command, ())
+        while waiters:
+            waiter = waiters.popleft()
+            # skip requests cancelled but not yet withdrawn
+            if not waiter.done():
+                waiter.set_result(message)
+                return
+        log.warning("Discarding unsolicited reply %s", type(message).__name__)
+
+    def send(self, message):
+        "Send a message to the NXT without waiting for a reply"
+        if self.transport is None or self.transport.is_closing():
+            raise ConnectionError("Not connected to the NXT")
+        self.transport.write(bytes(message))
+
+    async def request(self, command):
+        """
+        Send command and return its reply (or None if the command
+        solicits no reply).
+        """
+        if command.expected_reply is None:
+            self.send(command)
+            return None
+        waiter = asyncio.get_running_loop().create_future()
+        self.send(command)
+        waiters = self._pending[command.command]
+        waiters.append(waiter)
+        try:
+            return await waiter
+        finally:
+            # a cancelled request (as on a timeout) is no longer
+            #  awaiting a reply, so the next reply goes to the next
+            #  request
+            if waiter.cancelled():
+                with contextlib.suppress(ValueError):
+                    waiters.remove(waiter)
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+
+
+async def connect_socket(sock):
+    "Return an AsyncDevice communicating over a connected socket"
+    loop = asyncio.get_running_loop()
+    _, device = await loop.create_connection(AsyncDevice, sock=sock)
+    return device
+
+
+async def connect_bluetooth(host, port=BluetoothDevice.port):
+    "Connect to the NXT at the Bluetooth host address over RFCOMM"
+    sock = socket.socket(socket.AF_BLUETOOTH, socket.SOCK_STREAM, socket.BTPROTO_RFCOMM)
+    sock.setblocking(False)
+    try:
+        await asyncio.get_running_loop().sock_connect(sock, (host, port))
+    except BaseException:
+        sock.close()
+        raise
+    return await connect_socket(sock)
+
+
+async def connect_serial(port, **kwargs):
+    """
+    Connect to the NXT at the serial port. Requires pyserial-asyncio
+    (``pip install jaraco.nxt[aio]``).
+    """
+    import serial_asyncio
+
+    loop = asyncio.get_running_loop()
+    _, device = await serial_asyncio.create_serial_connection(
+        loop, AsyncDevice, port, **kwargs
+    )
+    return device
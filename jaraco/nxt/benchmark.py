@@ -0,0 +1,288 @@
+"""
+Benchmarks of the message layer and transports.
+
+Run ``python -m jaraco.nxt.benchmark`` to measure encoding and
+decoding of each message class, parsing of a long stream of frames,
+and round trips to a simulated brick over a socket pair and a
+pseudo-terminal. Save the results with ``--output`` and compare a
+later run against them with ``--compare``, which fails if any
+measurement regressed by more than the tolerance.
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from . import Connection, messages
+from .simulator import Simulator
+
+commands = [
+    messages.SetOutputState(
+        messages.OutputPort.b,
+        set_power=75,
+        motor_on=True,
+        run_state=messages.RunState.running,
+        tacho_limit=360,
+    ),
+    messages.GetOutputState(messages.OutputPort.a),
+    messages.SetInputMode(1, messages.SensorType.switch, messages.SensorMode.boolean),
+    messages.GetInputValues(1),
+    messages.ResetInputScaledValue(1),
+    messages.ResetMotorPosition(messages.OutputPort.c),
+    messages.PlayTone(440),
+    messages.GetBatteryLevel(),
+    messages.KeepAlive(),
+    messages.StopSoundPlayback(),
+    messages.MessageWrite('hello'),
+    messages.MessageRead(1),
+    messages.LSGetStatus(1),
+    messages.LSWrite(1, b'\x02\x42', 1),
+    messages.LSRead(1),
+]
+
+
+def reply_classes():
+    "Reply classes with a fixed structure"
+    return sorted(
+        {
+            cls.expected_reply
+            for cls in messages.Message._messages.values()
+            if cls.expected_reply and issubclass(cls.expected_reply, messages.Reply)
+        },
+        key=lambda cls: cls.__name__,
+    )
+
+
+def sample_payload(cls):
+    "A payload of zeros for a reply of cls"
+    command = next(
+        code
+        for code, command in messages.Message._messages.items()
+        if command.expected_reply is cls
+    )
+    return bytes([messages.CommandTypes.reply, command]) + bytes(cls._struct.size)
+
+
+def measure(func, number):
+    "Return the best time (in seconds) per call of func over three runs"
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def retained(func, number):
+    "Return the bytes retained per call of func, keeping each result"
+    # allocate the list of results before tracing
+    results = [None] * number
+    tracemalloc.start()
+    try:
+        for index in range(number):
+            results[index] = func()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current / number
+
+
+def allocated(func, number):
+    """
+    Return the bytes allocated per call of func (the peak of memory
+    allocated during the call, whether or not it's retained)
+    """
+    total = 0
+    tracemalloc.start()
+    try:
+        for _ in range(number):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - before
+    finally:
+        tracemalloc.stop()
+    return total / number
+
+
+def bench_codec(number):
+    buffer = bytearray(messages.Message.max_payload + 2)
+    for command in commands:
+        name = type(command).__name__
+        yield (
+            f'encode.{name}',
+            measure(lambda: command.encode_into(buffer), number) * 1e6,
+            'us',
+        )
+        yield (
+            f'encode.{name}.allocated',
+            allocated(lambda: command.encode_into(buffer), number),
+            'bytes',
+        )
+    for cls in reply_classes():
+        payload = sample_payload(cls)
+        name = cls.__name__
+        yield (
+            f'decode.{name}',
+            measure(lambda: messages.Message.decode(payload), number) * 1e6,
+            'us',
+        )
+        yield (
+            f'decode.{name}.allocated',
+            allocated(lambda: messages.Message.decode(payload), number),
+            'bytes',
+        )
+        yield (
+            f'decode.{name}.retained',
+            retained(lambda: messages.Message.decode(payload), number),
+            'bytes',
+        )
+
+
+def bench_stream(count):
+    "Parse a stream of count frames of varied replies"
+    payloads = [sample_payload(cls) for cls in reply_classes()]
+    frames = b''.join(
+        len(payload).to_bytes(2, 'little') + payload for payload in payloads
+    )
+    stream = frames * (count // len(payloads))
+    total = count // len(payloads) * len(payloads)
+
+    def read_all():
+        stream_file = io.BytesIO(stream)
+        for _ in range(total):
+            messages.Message.read(stream_file)
+
+    def feed_all():
+        decoder = messages.FrameDecoder()
+        for _ in decoder.feed(stream):
+            pass
+
+    yield 'stream.read', total / measure(read_all, 1), 'msg/s'
+    yield 'stream.feed', total / measure(feed_all, 1), 'msg/s'
+
+
+def round_trips(device, count, batch):
+    request = messages.GetOutputState(messages.OutputPort.a)
+    start = time.perf_counter()
+    for _ in range(count // batch):
+        device.request_many([request] * batch)
+    return count // batch * batch / (time.perf_counter() - start)
+
+
+def bench_round_trips(count, latency=0):
+    with Simulator(latency=latency) as sim:
+        device = sim.connect()
+        yield 'socket.request', round_trips(device, count, 1), 'req/s'
+        yield 'socket.request_many', round_trips(device, count, 8), 'req/s'
+    if os.name != 'posix':
+        return
+    with Simulator(latency=latency) as sim:
+        conn = Connection(sim.open_pty(), timeout=5)
+        yield 'pty.request', round_trips(conn, count, 1), 'req/s'
+        yield 'pty.request_many', round_trips(conn, count, 8), 'req/s'
+        conn.close()
+
+
+def run(number=10000, frames=100000, trips=2000):
+    "Run all benchmarks, returning the results as a dict"
+    measurements = [
+        *bench_codec(number),
+        *bench_stream(frames),
+        *bench_round_trips(trips),
+    ]
+    return dict(
+        meta=dict(
+            python=platform.python_version(),
+            implementation=platform.python_implementation(),
+            platform=platform.platform(),
+            time=time.time(),
+        ),
+        results={
+            name: dict(value=value, unit=unit) for name, value, unit in measurements
+        },
+    )
+
+
+def higher_is_better(unit):
+    return unit.endswith('/s')
+
+
+def compare(baseline, current, tolerance):
+    """
+    Generate descriptions of the measurements in current that
+    regressed by more than tolerance (a fraction) from baseline.
+
+    >>> baseline = dict(results=dict(
+    ...     a=dict(value=10, unit='us'), b=dict(value=100, unit='req/s')))
+    >>> current = dict(results=dict(
+    ...     a=dict(value=13, unit='us'), b=dict(value=95, unit='req/s')))
+    >>> list(compare(baseline, current, 0.2))
+    ['a: 13 us (baseline 10 us, +30%)']
+
+    Any growth from nothing (as of allocations) is a regression.
+
+    >>> baseline = dict(results=dict(a=dict(value=0, unit='bytes')))
+    >>> current = dict(results=dict(a=dict(value=64, unit='bytes')))
+    >>> list(compare(baseline, current, 0.2))
+    ['a: 64 bytes (baseline 0 bytes, +inf%)']
+    """
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if not base:
+            continue
+        if base['value']:
+            change = result['value'] / base['value'] - 1
+        else:
+            change = math.inf if result['value'] else 0
+        if higher_is_better(result['unit']):
+            change = -change
+        if change > tolerance:
+            yield (
+                f"{name}: {result['value']:.4g} {result['unit']} "
+                f"(baseline {base['value']:.4g} {base['unit']}, {change:+.0%})"
+            )
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-o', '--output', help="save the results as JSON")
+    parser.add_argument('--compare', help="JSON results of a baseline run")
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.25,
+        help="fraction by which a measurement may regress (default 0.25)",
+    )
+    parser.add_argument(
+        '--quick', action='store_true', help="fewer iterations, for a smoke test"
+    )
+    options = parser.parse_args(args)
+    scale = 0.01 if options.quick else 1
+    results = run(
+        number=int(10000 * scale), frames=int(100000 * scale), trips=int(2000 * scale)
+    )
+    for name, result in results['results'].items():
+        print(f"{name:40} {result['value']:12.4g} {result['unit']}")
+    if options.output:
+        with open(options.output, 'w', encoding='utf-8') as out:
+            json.dump(results, out, indent=2)
+    if options.compare:
+        with open(options.compare, encoding='utf-8') as base:
+            regressions = list(compare(json.load(base), results, options.tolerance))
+        for regression in regressions:
+            print('Regression:', regression, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
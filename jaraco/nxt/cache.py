@@ -0,0 +1,100 @@
+"""
+A persistent record of the bricks most recently found, so they may
+be tried before the (slow) discovery of all candidates.
+"""
+
+import contextlib
+import json
+import os
+import pathlib
+import time
+
+
+def default_path():
+    "The cache file in the user's cache directory"
+    root = os.environ.get('XDG_CACHE_HOME') or pathlib.Path.home() / '.cache'
+    return pathlib.Path(root) / 'jaraco.nxt' / 'bricks.json'
+
+
+class BrickCache:
+    """
+    Entries describing bricks verified to respond, persisted as JSON.
+
+    Each entry is a dict with the transport ('bluetooth' or 'serial'),
+    the address (host address or serial port), the RFCOMM port (for
+    Bluetooth), the name, and the time last seen.
+
+    >>> cache = BrickCache(getfixture('tmp_path') / 'bricks.json')
+    >>> cache.entries()
+    []
+    >>> entry = dict(transport='serial', address='/dev/rfcomm0', port=None, name=None)
+    >>> cache.remember(entry)
+    >>> [entry['address'] for entry in BrickCache(cache.path).entries()]
+    ['/dev/rfcomm0']
+    >>> cache.forget(entry)
+    >>> cache.entries()
+    []
+    """
+
+    max_age = 30 * 24 * 60 * 60
+    "Seconds after which an entry not seen is discarded"
+
+    def __init__(self, path=None):
+        self.path = pathlib.Path(path or default_path())
+
+    @staticmethod
+    def entry_for(device, name=None):
+        "Describe the device as a cache entry"
+        return dict(
+            transport=device.transport,
+            address=device.address,
+            port=getattr(device, 'rfcomm_port', None),
+            name=name or getattr(device, 'name', None),
+        )
+
+    def entries(self):
+        "Unexpired entries, most recently seen first"
+        horizon = time.time() - self.max_age
+        fresh = (entry for entry in self._load() if entry['last_seen'] > horizon)
+        return sorted(fresh, key=lambda entry: entry['last_seen'], reverse=True)
+
+    def remember(self, entry):
+        "Add or refresh the entry, marking it seen now"
+        entries = self._without(entry)
+        entries.append(dict(entry, last_seen=time.time()))
+        self._save(entries)
+
+    def forget(self, entry):
+        "Remove the entry (such as when the brick no longer responds)"
+        self._save(self._without(entry))
+
+    def _without(self, entry):
+        key = self._key(entry)
+        return [other for other in self.entries() if self._key(other) != key]
+
+    @staticmethod
+    def _key(entry):
+        return entry['transport'], entry['address']
+
+    def _load(self):
+        "The entries saved, ignoring any malformed"
+        with contextlib.suppress(FileNotFoundError, ValueError):
+            entries = json.loads(self.path.read_text(encoding='utf-8'))
+            if isinstance(entries, list):
+                return list(filter(self._valid, entries))
+        return []
+
+    @staticmethod
+    def _valid(entry):
+        return (
+            isinstance(entry, dict)
+            and isinstance(entry.get('transport'), str)
+            and isinstance(entry.get('address'), str)
+            and isinstance(entry.get('last_seen'), (int, float))
+        )
+
+    def _save(self, entries):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(entries, indent=2), encoding='utf-8')
+        os.replace(tmp, self.path)
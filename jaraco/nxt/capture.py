@@ -0,0 +1,368 @@
+"""
+Capture the frames exchanged with a device to a compact binary log,
+and replay them.
+
+A capture begins with a magic number followed by a record for each
+frame: a direction byte (SENT or RECEIVED), the monotonic timestamp in
+nanoseconds (a signed 64-bit integer), and the length of the frame
+(16 bits), all little-endian, followed by the frame as transmitted
+(including its length prefix).
+
+>>> from jaraco.nxt import simulator
+>>> path = getfixture('tmp_path') / 'session.nxtcap'
+>>> with simulator.Simulator() as sim:
+...     with Recorder(sim.connect(), CaptureWriter(path)) as dev:
+...         dev.request(messages.GetBatteryLevel()).millivolts
+7800
+>>> [(record.direction, len(record.frame)) for record in read_records(path)]
+[(0, 4), (1, 7)]
+>>> ReplayDevice(path).receive().millivolts
+7800
+"""
+
+import array
+import bisect
+import contextlib
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import NamedTuple
+
+from . import Device, messages
+
+magic = b'NXTCAP\x00\x01'
+record_header = struct.Struct('<BqH')
+
+SENT = 0
+RECEIVED = 1
+
+
+class Record(NamedTuple):
+    direction: int
+    timestamp: int
+    frame: bytes
+
+
+class CaptureWriter:
+    """
+    Append records to the capture at path, buffering writes so that
+    recording costs little more than a memory copy.
+    """
+
+    def __init__(self, path, buffering=64 * 1024):
+        self.file = open(path, 'ab', buffering=buffering)
+        if not self.file.tell():
+            self.file.write(magic)
+        self._lock = threading.Lock()
+
+    def write(self, direction, frame, timestamp=None):
+        "Append a record of the frame"
+        if timestamp is None:
+            timestamp = time.monotonic_ns()
+        with self._lock:
+            self.file.write(record_header.pack(direction, timestamp, len(frame)))
+            self.file.write(frame)
+
+    def write_frames(self, direction, data):
+        "Append a record for each frame in data (such as a coalesced write)"
+        timestamp = time.monotonic_ns()
+        view = memoryview(data)
+        while view:
+            size = messages._length.unpack_from(view)[0] + 2
+            self.write(direction, view[:size], timestamp)
+            view = view[size:]
+
+    def flush(self):
+        with self._lock:
+            self.file.flush()
+
+    def close(self):
+        with self._lock:
+            self.file.close()
+
+
+def read_records(path):
+    "Generate the records in the capture at path"
+    with open(path, 'rb') as file:
+        if file.read(len(magic)) != magic:
+            raise ValueError(f"{path} is not a capture")
+        while header := file.read(record_header.size):
+            if len(header) < record_header.size:
+                # a partial record, as when the recorder was interrupted
+                return
+            direction, timestamp, size = record_header.unpack(header)
+            frame = file.read(size)
+            if len(frame) < size:
+                return
+            yield Record(direction, timestamp, frame)
+
+
+class Recorder(Device):
+    """
+    Wrap a device, recording each frame sent and received to a
+    CaptureWriter. Other attributes are those of the device.
+    """
+
+    def __init__(self, device, capture):
+        self.device = device
+        self.capture = capture
+        self.chunk_size = device.chunk_size
+
+    def __getattr__(self, name):
+        return getattr(self.device, name)
+
+    def read(self, nbytes):
+        return self.device.read(nbytes)
+
+    def write(self, data):
+        self.device.write(data)
+        self.capture.write_frames(SENT, data)
+
+    def receive(self):
+        message = super().receive()
+        self.capture.write(RECEIVED, bytes(message))
+        return message
+
+    def close(self):
+        self.capture.close()
+        self.device.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ReplayDevice(Device):
+    """
+    A device whose reads play back the frames received in a capture.
+
+    Frames are delivered at their original pace divided by speed (so
+    a speed of 10 replays ten times faster), or as fast as possible
+    if speed is None. Messages sent are discarded. Once the capture
+    is exhausted, receive raises EOFError.
+    """
+
+    def __init__(self, path, speed=None):
+        self.speed = speed
+        self._frames = (
+            record for record in read_records(path) if record.direction == RECEIVED
+        )
+        self._pending = memoryview(b'')
+        self._origin = None
+
+    def read(self, nbytes):
+        if not self._pending:
+            record = next(self._frames, None)
+            if record is None:
+                return b''
+            self._wait(record.timestamp)
+            self._pending = memoryview(record.frame)
+        data, self._pending = self._pending[:nbytes], self._pending[nbytes:]
+        return bytes(data)
+
+    def _wait(self, timestamp):
+        "Wait until the time at which the frame was originally received"
+        if self.speed is None:
+            return
+        now = time.monotonic_ns()
+        if self._origin is None:
+            self._origin = now, timestamp
+        start, first = self._origin
+        due = start + (timestamp - first) / self.speed
+        if due > now:
+            time.sleep((due - now) / 1e9)
+
+    def write(self, data):
+        pass
+
+    def close(self):
+        self._frames.close()
+
+
+class Frame(NamedTuple):
+    """
+    A record of a capture, whose data is a view of the mapped capture
+    (decoded only on request).
+    """
+
+    direction: int
+    timestamp: int
+    data: memoryview
+
+    @property
+    def command(self):
+        "The command byte of the frame"
+        return self.data[3]
+
+    def decode(self):
+        "The message in the frame"
+        payload = self.data[2:]
+        if self.direction == RECEIVED:
+            return messages.Message.decode(payload)
+        cls = messages.Message._messages.get(self.command)
+        if cls is None:
+            # an unknown command; leave the payload undecoded
+            message = messages.Message.__new__(messages.Message)
+            message.payload = bytes(payload)
+            return message
+        return cls.from_payload(payload)
+
+
+class CaptureReader:
+    """
+    Random access to the records of a capture through a memory map.
+
+    A sparse index of the timestamp and offset of every stride-th
+    record is persisted beside the capture (with the suffix '.idx'),
+    so reopening a large capture needn't scan it; records appended
+    since the index was saved are indexed on open.
+
+    >>> path = getfixture('tmp_path') / 'session.nxtcap'
+    >>> writer = CaptureWriter(path)
+    >>> battery = bytes(messages.GetBatteryLevel())
+    >>> for n in range(10):
+    ...     writer.write(SENT, battery, timestamp=n * 1000)
+    >>> writer.close()
+    >>> with CaptureReader(path, stride=4) as reader:
+    ...     len(reader), reader[-1].timestamp
+    ...     [frame.timestamp for frame in reader.frames(start=2500, end=5000)]
+    (10, 9000)
+    [3000, 4000]
+    """
+
+    index_magic = b'NXTIDX\x00\x02'
+    index_header = struct.Struct('<QQQ')
+    "stride, record count, and offset of the end of the last record"
+
+    index_entry = struct.Struct('<qQ')
+
+    def __init__(self, path, stride=1024):
+        self.path = path
+        self.stride = stride
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        if self._view[: len(magic)] != magic:
+            raise ValueError(f"{path} is not a capture")
+        self._timestamps = array.array('q')
+        self._offsets = array.array('Q')
+        self.count = 0
+        self._end = len(magic)
+        self._load_index()
+        if self._extend_index():
+            self._save_index()
+
+    @property
+    def _index_path(self):
+        return os.fspath(self.path) + '.idx'
+
+    def _walk(self, offset):
+        "Generate (offset, direction, timestamp, frame) from offset"
+        view = self._view
+        size = len(view)
+        while offset + record_header.size <= size:
+            direction, timestamp, length = record_header.unpack_from(view, offset)
+            start = offset + record_header.size
+            if start + length > size:
+                # a partial record still being written
+                return
+            yield offset, direction, timestamp, view[start : start + length]
+            offset = start + length
+
+    def _extend_index(self):
+        "Index records after those already indexed; return the number added"
+        added = 0
+        for offset, _, timestamp, data in self._walk(self._end):
+            if not self.count % self.stride:
+                self._timestamps.append(timestamp)
+                self._offsets.append(offset)
+            self.count += 1
+            self._end = offset + record_header.size + len(data)
+            added += 1
+        return added
+
+    def _load_index(self):
+        with contextlib.suppress(FileNotFoundError):
+            with open(self._index_path, 'rb') as file:
+                data = file.read()
+            if not data.startswith(self.index_magic):
+                return
+            stride, count, end = self.index_header.unpack_from(
+                data, len(self.index_magic)
+            )
+            if stride != self.stride or end > len(self._view):
+                return
+            entries = self.index_entry.iter_unpack(
+                memoryview(data)[len(self.index_magic) + self.index_header.size :]
+            )
+            for timestamp, offset in entries:
+                self._timestamps.append(timestamp)
+                self._offsets.append(offset)
+            self.count, self._end = count, end
+
+    def _save_index(self):
+        entries = zip(self._timestamps, self._offsets)
+        tmp = self._index_path + '.tmp'
+        with open(tmp, 'wb') as file:
+            file.write(self.index_magic)
+            file.write(self.index_header.pack(self.stride, self.count, self._end))
+            file.writelines(self.index_entry.pack(*entry) for entry in entries)
+        os.replace(tmp, self._index_path)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, number):
+        if number < 0:
+            number += self.count
+        if not 0 <= number < self.count:
+            raise IndexError(number)
+        block, skip = divmod(number, self.stride)
+        records = self._walk(self._offsets[block])
+        for _ in range(skip):
+            next(records)
+        return self._frame(next(records))
+
+    @staticmethod
+    def _frame(record):
+        _, direction, timestamp, data = record
+        return Frame(direction, timestamp, data)
+
+    def frames(self, start=None, end=None, direction=None, command=None):
+        """
+        Generate the frames with timestamps in [start, end), optionally
+        only those in direction or bearing the command byte.
+        """
+        offset = len(magic)
+        if start is not None and self.count:
+            block = max(bisect.bisect_left(self._timestamps, start) - 1, 0)
+            offset = self._offsets[block]
+        for record in self._walk(offset):
+            _, rec_direction, timestamp, data = record
+            if start is not None and timestamp < start:
+                continue
+            if end is not None and timestamp >= end:
+                return
+            if direction is not None and rec_direction != direction:
+                continue
+            if command is not None and data[3] != command:
+                continue
+            yield self._frame(record)
+
+    __iter__ = frames
+
+    def close(self):
+        "Release the map (unless frames still reference it)"
+        with contextlib.suppress(BufferError):
+            self._view.release()
+            self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,204 @@
+"""
+Publish replies (such as ``InputValues`` or ``OutputState``) through
+a ring in shared memory, for any number of subscribers in other
+processes on the same host.
+
+>>> with Publisher(messages.BatteryResponse, capacity=8) as publisher:
+...     with Subscriber(publisher.name) as subscriber:
+...         publisher.publish(messages.BatteryResponse(b'\\x02\\x0b\\x00\\x78\\x1e'))
+...         [record.reply.millivolts for record in subscriber.poll()]
+[7800]
+
+The memory begins with a header: a magic number, the capacity (in
+records), the size of each slot, the name of the reply class, and the
+count of records published. Each slot holds the sequence number of
+its record, the timestamp, and the payload of the reply. A slot's
+sequence number is invalidated while the slot is written, so a
+subscriber can detect a record overwritten as it was read.
+"""
+
+import struct
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import NamedTuple
+
+from . import messages
+
+magic = b'NXTSHM\x00\x01'
+header = struct.Struct('<8sQQ32s')
+counter = struct.Struct('<q')
+slot_header = struct.Struct('<qd')
+
+_count_offset = header.size
+_slots_offset = header.size + counter.size
+_writing = -1
+
+
+class Record(NamedTuple):
+    sequence: int
+    timestamp: float
+    reply: messages.Message
+
+
+def _slot_size(cls):
+    "The size of a slot for a reply of cls, aligned to eight bytes"
+    size = slot_header.size + 2 + cls._struct.size
+    return -(-size // 8) * 8
+
+
+class Publisher:
+    """
+    Create a shared-memory ring of capacity records of replies of cls
+    and publish replies to it. Only one publisher may write a ring.
+    """
+
+    def __init__(self, cls, capacity=65536, name=None):
+        if cls._struct is None:
+            raise TypeError(f"{cls.__name__} has no fixed structure")
+        self.cls = cls
+        self.capacity = capacity
+        self.slot_size = _slot_size(cls)
+        self.memory = shared_memory.SharedMemory(
+            name=name, create=True, size=_slots_offset + capacity * self.slot_size
+        )
+        self._buffer = self.memory.buf
+        header.pack_into(
+            self._buffer,
+            0,
+            magic,
+            capacity,
+            self.slot_size,
+            cls.__name__.encode('ascii'),
+        )
+        self.count = 0
+        counter.pack_into(self._buffer, _count_offset, 0)
+
+    @property
+    def name(self):
+        "The name by which subscribers attach"
+        return self.memory.name
+
+    def publish(self, reply, timestamp=None):
+        "Publish the reply (received at timestamp, by default now)"
+        sequence = self.count
+        offset = _slots_offset + sequence % self.capacity * self.slot_size
+        buffer = self._buffer
+        payload = reply.payload
+        if len(payload) != 2 + self.cls._struct.size:
+            raise ValueError(f"Payload does not match {self.cls.__name__}")
+        counter.pack_into(buffer, offset, _writing)
+        start = offset + slot_header.size
+        buffer[start : start + len(payload)] = payload
+        slot_header.pack_into(
+            buffer,
+            offset,
+            sequence,
+            time.monotonic() if timestamp is None else timestamp,
+        )
+        self.count = sequence + 1
+        counter.pack_into(buffer, _count_offset, self.count)
+
+    def on_sample(self, sample):
+        "Publish a sample from a SensorPoller (for use as its callback)"
+        self.publish(sample.values, sample.time)
+
+    def close(self):
+        "Close and destroy the ring"
+        self._buffer.release()
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _reply_classes():
+    "Reply classes by name"
+    return {
+        command.expected_reply.__name__: command.expected_reply
+        for command in messages.Message._messages.values()
+        if command.expected_reply
+    }
+
+
+def _attach(name):
+    "Attach to the shared memory without taking responsibility to unlink it"
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    memory = shared_memory.SharedMemory(name=name)
+    if sys.platform != 'win32':
+        # python/cpython#82300
+        resource_tracker.unregister(memory._name, 'shared_memory')
+    return memory
+
+
+class Subscriber:
+    """
+    Read the records published to the ring named name, beginning with
+    the next record published (or, if replay, the oldest retained).
+
+    Records overwritten before they are read are skipped and counted
+    as ``lost``.
+    """
+
+    def __init__(self, name, replay=False):
+        self.memory = _attach(name)
+        self._buffer = self.memory.buf
+        found, self.capacity, self.slot_size, cls_name = header.unpack_from(
+            self._buffer
+        )
+        if found != magic:
+            raise ValueError(f"{name} is not a telemetry channel")
+        self.cls = _reply_classes()[cls_name.rstrip(b'\x00').decode('ascii')]
+        self._payload_size = 2 + self.cls._struct.size
+        self.lost = 0
+        published = self.published
+        self.next = max(published - self.capacity, 0) if replay else published
+
+    @property
+    def published(self):
+        "The number of records published"
+        return counter.unpack_from(self._buffer, _count_offset)[0]
+
+    def poll(self):
+        "Return the records published since the last poll"
+        published = self.published
+        oldest = published - self.capacity
+        if self.next < oldest:
+            self.lost += oldest - self.next
+            self.next = oldest
+        records = []
+        for sequence in range(self.next, published):
+            record = self._read(sequence)
+            if record is None:
+                self.lost += 1
+                continue
+            records.append(record)
+        self.next = published
+        return records
+
+    def _read(self, sequence):
+        "Read the record from its slot, or None if it was overwritten"
+        buffer = self._buffer
+        offset = _slots_offset + sequence % self.capacity * self.slot_size
+        found, timestamp = slot_header.unpack_from(buffer, offset)
+        start = offset + slot_header.size
+        payload = bytes(buffer[start : start + self._payload_size])
+        if found != sequence or counter.unpack_from(buffer, offset)[0] != sequence:
+            return None
+        return Record(sequence, timestamp, self.cls(payload))
+
+    def close(self):
+        "Detach from the ring"
+        self._buffer.release()
+        self.memory.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
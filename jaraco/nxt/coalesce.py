@@ -0,0 +1,116 @@
+"""
+Coalesce the frames of several messages into fewer writes.
+
+Each write to the NXT over Bluetooth costs a packet turnaround,
+so a burst of commands is delivered faster as a single write.
+"""
+
+import threading
+import time
+
+from . import messages
+
+
+class CoalescingWriter:
+    """
+    Buffer the messages sent to a device, writing them to the device
+    together when the buffer reaches threshold bytes, when latency
+    seconds have passed since the first message was buffered, or on
+    flush().
+
+    A latency of None waits for the threshold or an explicit flush.
+
+    >>> class Device(list):
+    ...     write = lambda self, data: self.append(bytes(data))
+    >>> dev = Device()
+    >>> writer = CoalescingWriter(dev, threshold=12, latency=None)
+    >>> writer.send(messages.GetBatteryLevel())
+    4
+    >>> writer.send(messages.GetOutputState(messages.OutputPort.a))
+    5
+    >>> dev
+    []
+    >>> writer.flush()
+    >>> len(dev), len(dev[0])
+    (1, 9)
+
+    Reaching the threshold writes immediately.
+
+    >>> for port in range(3):
+    ...     _ = writer.send(messages.GetOutputState(port))
+    >>> len(dev), len(dev[1])
+    (2, 15)
+    """
+
+    def __init__(self, device, threshold=256, latency=0.002):
+        self.device = device
+        self.threshold = threshold
+        self.latency = latency
+        self._buffer = bytearray(threshold + messages.Message.max_payload + 2)
+        self._size = 0
+        self._deadline = None
+        self._closed = False
+        self._ready = threading.Condition()
+        self._flusher = None
+
+    def send(self, message):
+        """
+        Buffer the message, writing if the threshold is reached.
+        Return the size of the encoded message.
+        """
+        with self._ready:
+            size = message.encode_into(self._buffer, self._size)
+            self._size += size
+            if self._size >= self.threshold:
+                self._flush()
+            elif self._deadline is None and self.latency is not None:
+                self._deadline = time.monotonic() + self.latency
+                self._start_flusher()
+                self._ready.notify()
+            return size
+
+    def flush(self):
+        "Write any buffered messages"
+        with self._ready:
+            self._flush()
+
+    def _flush(self):
+        self._deadline = None
+        if not self._size:
+            return
+        self.device.write(memoryview(self._buffer)[: self._size])
+        self._size = 0
+
+    def _start_flusher(self):
+        if self._flusher is not None:
+            return
+        self._flusher = threading.Thread(target=self._run, daemon=True)
+        self._flusher.start()
+
+    def _run(self):
+        "Flush the buffer when the latency budget has elapsed"
+        with self._ready:
+            while not self._closed:
+                if self._deadline is None:
+                    self._ready.wait()
+                    continue
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._ready.wait(remaining)
+                    continue
+                self._flush()
+
+    def close(self):
+        "Write any buffered messages and stop coalescing"
+        with self._ready:
+            self._flush()
+            self._closed = True
+            self._ready.notify()
+        if getattr(self.device, '_writer', None) is self:
+            self.device._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
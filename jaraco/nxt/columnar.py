@@ -0,0 +1,124 @@
+"""
+Decode batches of replies of one type into NumPy structured arrays,
+whose fields are columns (such as ``tacho_count``) rather than a
+Python object per reply.
+
+Requires numpy (install the ``columnar`` extra).
+
+>>> frames = bytes(messages.BatteryResponse(b'\\x02\\x0b\\x00\\x78\\x1e')) * 3
+>>> batch = decode(messages.BatteryResponse, frames)
+>>> batch['millivolts']
+array([7800, 7800, 7800], dtype=uint16)
+>>> batch.dtype.names
+('status', 'millivolts')
+"""
+
+import functools
+
+import numpy as np
+
+from . import messages
+from ._enum import CommandTypes
+from .capture import RECEIVED
+
+_codes = {
+    'c': 'S1',
+    'b': 'i1',
+    'B': 'u1',
+    '?': '?',
+    'h': '<i2',
+    'H': '<u2',
+    'i': '<i4',
+    'I': '<u4',
+    'l': '<i4',
+    'L': '<u4',
+    'q': '<i8',
+    'Q': '<u8',
+    'e': '<f2',
+    'f': '<f4',
+    'd': '<f8',
+}
+
+
+@functools.lru_cache(maxsize=None)
+def frame_dtype(cls):
+    """
+    The structured dtype of a frame bearing a reply of cls, including
+    the length prefix and header (as ``_length``, ``_type``, and
+    ``_command``).
+
+    >>> frame_dtype(messages.BatteryResponse)
+    dtype([('_length', '<u2'), ('_type', 'u1'), ('_command', 'u1'), ('status', 'u1'), ('millivolts', '<u2')])
+
+    A Pascal string field is split into its length (as the field's
+    name suffixed with ``_length``) and the space for its data, of
+    which only the first length bytes are the value.
+
+    >>> frame_dtype(messages.LSReadResponse).names
+    ('_length', '_type', '_command', 'status', 'data_length', 'data')
+    """
+    if cls._struct is None:
+        raise TypeError(f"{cls.__name__} has no fixed structure")
+    layout = list(messages._layout(cls.structure))
+    if len(layout) != len(cls.fields):
+        raise TypeError(f"{cls.__name__} fields don't match its structure")
+    names, formats, offsets = (
+        ['_length', '_type', '_command'],
+        ['<u2', 'u1', 'u1'],
+        [0, 2, 3],
+    )
+    for field, (format, offset) in zip(cls.fields, layout):
+        if format[-1] == 'p':
+            names.append(f'{field}_length')
+            formats.append('u1')
+            offsets.append(offset + 4)
+            names.append(field)
+            formats.append(f'S{int(format[:-1]) - 1}')
+            offsets.append(offset + 5)
+            continue
+        names.append(field)
+        formats.append(f'S{format[:-1]}' if format[-1] == 's' else _codes[format])
+        offsets.append(offset + 4)
+    return np.dtype(
+        dict(names=names, formats=formats, offsets=offsets, itemsize=cls._frame.size)
+    )
+
+
+def command_for(cls):
+    "The command byte of the command soliciting a reply of cls"
+    return next(
+        code
+        for code, command in messages.Message._messages.items()
+        if command.expected_reply is cls
+    )
+
+
+def decode(cls, data):
+    """
+    Decode data, consecutive frames each bearing a reply of cls, into
+    a structured array (a view of data) with a field for each of the
+    fields of cls (and for the length of each Pascal string field, as
+    described by ``frame_dtype``).
+    """
+    frames = np.frombuffer(data, dtype=frame_dtype(cls))
+    expected = cls._frame.size - 2, CommandTypes.reply, command_for(cls)
+    header = frames['_length'], frames['_type'], frames['_command']
+    if not all((column == value).all() for column, value in zip(header, expected)):
+        raise ValueError(f"data contains frames other than {cls.__name__}")
+    return frames[list(frame_dtype(cls).names[3:])]
+
+
+def from_capture(reader, cls, **filters):
+    """
+    Gather the replies of cls received in a capture (a
+    ``capture.CaptureReader``), optionally filtered as by
+    ``CaptureReader.frames``, returning an array of their timestamps
+    and a structured array of the replies.
+    """
+    selected = list(
+        reader.frames(direction=RECEIVED, command=command_for(cls), **filters)
+    )
+    timestamps = np.fromiter(
+        (frame.timestamp for frame in selected), dtype='<i8', count=len(selected)
+    )
+    return timestamps, decode(cls, b''.join(frame.data for frame in selected))
@@ -3,6 +3,7 @@ functions to facilitate input
 """
 
 import argparse
+import time
 from collections import defaultdict
 
 import jaraco.nxt
@@ -41,6 +42,13 @@ class MotorController:
     scale_a = 1
     scale_b = 1
     scale_c = 1
+    control_rate = None
+    """
+    If set, the rate (in Hz) at which commands are sent. Rather than
+    sending commands on every joystick event, events only update the
+    controller state, and the latest state is sent once per tick (see
+    tick).
+    """
 
     def __init__(self, options):
         self.conn = Connection(options.port)
@@ -50,6 +58,8 @@ class MotorController:
             self.scale_b = options.scale_b
         if options.scale_c:
             self.scale_c = options.scale_c
+        if options.control_rate:
+            self.control_rate = options.control_rate
         try:
             self.input = Joystick.enumerate_devices()[0]
         except IndexError:
@@ -57,38 +67,72 @@ class MotorController:
         # keep track of the state of the controller (initial state
         #  assumes all values are zero).
         self.controller_state = defaultdict(lambda: 0)
+        # the power last sent to each port in control-rate mode
+        self.sent_powers = {}
 
         # register the joystick on_axis event
         self.input.event(self.on_axis)
 
     def on_axis(self, axis, value):
         self.controller_state[axis] = value
-        self.on_state_changed()
+        if not self.control_rate:
+            self.on_state_changed()
 
-    def on_state_changed(self):
+    def get_powers(self):
+        "Compute the power for each port from the controller state"
         st = self.controller_state
 
         # let the left trigger be reverse and the right trigger be forward,
         # use the difference to determine the motor power.
         a_reverse = st['left_trigger']
         a_forward = st['right_trigger']
+        # note a_power in [-1, 1]
         a_power = a_forward - a_reverse
         a_power *= self.scale_a
 
-        # note a_power in [-1, 1]
-        self.set_port(OutputPort.a, a_power)
-
         # multiply by 2 because it's a signed value [-0.5,0.5]
         b_power = st['l_thumb_y'] * 2
         b_power *= self.scale_b
-        self.set_port(OutputPort.b, b_power)
 
         c_power = st['r_thumb_y'] * 2
         c_power *= self.scale_c
-        self.set_port(OutputPort.c, c_power)
+
+        return {OutputPort.a: a_power, OutputPort.b: b_power, OutputPort.c: c_power}
+
+    def on_state_changed(self):
+        # send the commands for all three ports in one write
+        with self.conn.coalesce(latency=None):
+            for port, power in self.get_powers().items():
+                self.set_port(port, power)
+
+    def tick(self):
+        """
+        In control-rate mode, called once per tick to send the
+        latest state, skipping ports whose power is unchanged since
+        it was last sent.
+        """
+        powers = {
+            port: self.scale_power(power) for port, power in self.get_powers().items()
+        }
+        changed = {
+            port: power
+            for port, power in powers.items()
+            if self.sent_powers.get(port) != power
+        }
+        with self.conn.coalesce(latency=None):
+            for port, power in changed.items():
+                self.send_power(port, power)
+        self.sent_powers.update(changed)
 
     def set_port(self, port, power):
         "Set the output port to the specified power"
+        self.send_power(port, self.scale_power(power))
+
+    def scale_power(self, power):
+        """
+        Scale the power from the controller to the NXT power (-100 to
+        100), or zero if the power is too small to actuate a motor.
+        """
 
         # first, scale the power using the provided exponent
         #  A scale_exponent < 1 makes the sensor less sensitive near
@@ -99,24 +143,29 @@ class MotorController:
         else:
             power = scaled_power
 
-        # NXT expects a power between -100 and 100.
-        power *= 100
+        # NXT expects an integer power between -100 and 100.
+        power = int(round(power * 100))
         # with rounding errors, sometimes the power is greater than 100
         #  or less than -100.
-        # TODO: should I just round here?
-        #  i.e. power = int(round(power))
         power = max(min(power, 100), -100)
         # here, I'm disabling the motor if the output is less than 50, because
         #  those levels of power don't seem to be able to do much to actuate
         #  movement.
         # I note now that the regulation mode may be useful to actuate movement when
         #  the load is preventing movement at that power level.
-        if abs(power) > 50:
-            cmd = SetOutputState(
+        if abs(power) <= 50:
+            power = 0
+        return power
+
+    def send_power(self, port, power):
+        "Send the (scaled) power to the output port, stopping it at zero"
+        # the power is already clamped to range, so skip validation
+        if power:
+            cmd = SetOutputState.fast(
                 port, motor_on=True, set_power=power, run_state=RunState.running
             )
         else:
-            cmd = SetOutputState(port)
+            cmd = SetOutputState.fast(port)
         self.conn.send(cmd)
 
     @staticmethod
@@ -124,6 +173,11 @@ class MotorController:
         parser.add_argument('--scale_a', type=float)
         parser.add_argument('--scale_b', type=float)
         parser.add_argument('--scale_c', type=float)
+        parser.add_argument(
+            '--control-rate',
+            type=float,
+            help="send commands at most this many times per second",
+        )
 
 
 def _get_options():
@@ -153,9 +207,16 @@ def print_voltage(controller):
 def serve_forever():
     controller = MotorController(_get_options())
     print_voltage(controller)
+    interval = controller.control_rate and 1 / controller.control_rate
+    next_tick = time.monotonic()
     while True:
         try:
             controller.input.dispatch_events()
+            now = time.monotonic()
+            if interval and now >= next_tick:
+                controller.tick()
+                # don't try to catch up on missed ticks
+                next_tick = max(next_tick + interval, now)
         except KeyboardInterrupt:
             break
     controller.conn.close()
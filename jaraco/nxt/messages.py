@@ -3,6 +3,8 @@ import re
 import operator
 import logging
 import functools
+import inspect
+import itertools
 
 from typing import Dict, Tuple, Optional, Type
 
@@ -19,6 +21,8 @@ from ._enum import (
 
 log = logging.getLogger(__name__)
 
+_length = struct.Struct('<H')
+
 
 class MetaMessage(type):
     """
@@ -29,11 +33,181 @@ class MetaMessage(type):
     "A map of message classes by byte code"
     _messages: Dict[int, Type['Message']] = {}
 
+    def __new__(meta, name, bases, attrs):
+        """
+        Unless the class declares its own, generate __slots__ for the
+        attributes of its instances: its fields and the parameters to
+        its __init__, less any the class otherwise defines (such as
+        properties).
+
+        For classes whose fields are lazy, define instead a Field for
+        each field and slots to hold the values once decoded.
+
+        Slots are generated only for the classes defined here; instances
+        of subclasses defined elsewhere retain a __dict__ (unless they
+        declare __slots__), as they may set attributes of their own.
+        """
+        if '__slots__' not in attrs:
+            names = meta._lazy_slots(bases, attrs) or meta._attributes(bases, attrs)
+            if attrs.get('__module__') != __name__:
+                return super().__new__(meta, name, bases, attrs)
+            inherited = set().union(*map(_slots, bases))
+            attrs['__slots__'] = tuple(
+                name for name in dict.fromkeys(names) if name not in inherited
+            )
+        return super().__new__(meta, name, bases, attrs)
+
+    @staticmethod
+    def _lazy_slots(bases, attrs):
+        lazy = attrs.get('lazy', any(getattr(base, 'lazy', False) for base in bases))
+        if not lazy:
+            return []
+        fields = attrs.get('fields', getattr(bases[0], 'fields', ()))
+        structure = attrs.get('structure', getattr(bases[0], 'structure', ''))
+        layout = list(_layout(structure)) if isinstance(structure, str) else []
+        if len(layout) != len(fields):
+            # parse eagerly, as the structure doesn't describe the fields
+            attrs['lazy'] = False
+            return []
+        if 'fields' in attrs or 'structure' in attrs:
+            for field, (format, offset) in zip(fields, layout):
+                attrs[field] = Field(format, offset + 2)
+        return ['_' + field for field in fields]
+
+    @staticmethod
+    def _attributes(bases, attrs):
+        fields = attrs.get('fields', ())
+        init = attrs.get('__init__')
+        params = inspect.signature(init).parameters.values() if init else ()
+        named = (
+            param.name
+            for param in params
+            if param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY)
+        )
+        return [
+            name
+            for name in (*fields, *itertools.islice(named, 1, None))
+            if name not in attrs and not any(hasattr(base, name) for base in bases)
+        ]
+
     def __init__(cls, name, bases, attrs):
         "Store the command classes here for reference"
         if 'command' in attrs:
             code = attrs['command']
             cls._messages[code] = cls
+        cls._compile_codec()
+
+    def _compile_codec(cls):
+        """
+        Compile the struct for this class's payload once, rather than
+        on every parse or encode.
+
+        Classes whose structure varies per instance (declared as a
+        property) get no compiled struct and are compiled on demand
+        (see ``Message._get_struct``).
+
+        >>> BatteryResponse._struct.format
+        '<BH'
+        >>> BatteryResponse._struct.size
+        3
+        >>> LSWrite._struct is None
+        True
+        """
+        structure = cls.structure
+        if not isinstance(structure, str):
+            cls._struct = cls._frame = None
+            return
+        cls._struct = _compile(structure)
+        cls._frame = _compile('HBB' + structure)
+        cls._get_values = staticmethod(_values_getter(cls.fields))
+
+
+_token = re.compile(r'(\d*)([xcbB?hHiIlLqQefdsp])')
+
+
+def _layout(structure):
+    """
+    Generate the format and offset of each value packed according to
+    the struct format structure.
+
+    >>> list(_layout('2Bx3sH'))
+    [('B', 0), ('B', 1), ('3s', 3), ('H', 6)]
+    """
+    offset = 0
+    for count, code in _token.findall(structure):
+        count = int(count or 1)
+        if code in 'sp':
+            # a single value of count bytes
+            yield f'{count}{code}', offset
+        elif code != 'x':
+            size = struct.calcsize('<' + code)
+            for index in range(count):
+                yield code, offset + index * size
+        offset += struct.calcsize(f'<{count}{code}')
+
+
+class Field:
+    """
+    A field of a message, decoded from the payload at offset when
+    first read (and retained thereafter in the slot of the same name
+    prefixed by an underscore).
+    """
+
+    __slots__ = 'codec', 'offset', 'slot'
+
+    def __init__(self, format, offset):
+        self.codec = _compile(format)
+        self.offset = offset
+
+    def __set_name__(self, owner, name):
+        self.slot = '_' + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return getattr(instance, self.slot)
+        except AttributeError:
+            pass
+        (value,) = self.codec.unpack_from(instance.payload, self.offset)
+        setattr(instance, self.slot, value)
+        return value
+
+    def __set__(self, instance, value):
+        setattr(instance, self.slot, value)
+
+
+def _slots(cls):
+    "All slots of cls, including those of its bases"
+    return {slot for base in cls.__mro__ for slot in getattr(base, '__slots__', ())}
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(structure):
+    "Return a compiled little-endian struct for the structure"
+    return struct.Struct('<' + structure)
+
+
+def _values_getter(fields):
+    """
+    Return a function returning the values of fields on an object
+    as a tuple (suitable for packing).
+
+    >>> import types
+    >>> ob = types.SimpleNamespace(a=1, b=2)
+    >>> _values_getter(('a', 'b'))(ob)
+    (1, 2)
+    >>> _values_getter(('a',))(ob)
+    (1,)
+    >>> _values_getter(())(ob)
+    ()
+    """
+    if not fields:
+        return lambda ob: ()
+    getter = operator.attrgetter(*fields)
+    if len(fields) == 1:
+        return lambda ob: (getter(ob),)
+    return getter
 
 
 class Message(metaclass=MetaMessage):
@@ -49,9 +223,13 @@ class Message(metaclass=MetaMessage):
     no reply is to be solicited. (Can this be relegated to Command?)
     """
 
+    __slots__ = ('payload', '__weakref__')
+
     expected_reply: Optional[Type['Message']] = None
     fields: Tuple[str, ...] = ()
     structure = ''
+    lazy = False
+    "Whether fields are decoded when read (see Field)"
 
     def __init__(self, payload):
         """
@@ -62,18 +240,45 @@ class Message(metaclass=MetaMessage):
         self.payload = payload
         self.parse_payload()
 
+    def _get_struct(self):
+        "The compiled struct for this message's payload"
+        return self._struct or _compile(self.structure)
+
     def parse_payload(self):
-        try:
-            values = struct.unpack('<' + self.structure, self.payload[2:])
-            list(map(lambda f, v: setattr(self, f, v), self.fields, values))
-        except struct.error:
+        codec = self._get_struct()
+        if len(self.payload) - 2 != codec.size:
             log.warning("Payload does not match structure")
             log.debug("Payload is %r", self.payload)
             log.debug("Structure is %r", self.structure)
+            return
+        for field, value in zip(self.fields, codec.unpack_from(self.payload, 2)):
+            setattr(self, field, value)
 
-    def __str__(self):
-        assert len(self) <= 64
-        return struct.pack('<H', len(self)) + self.payload
+    max_payload = 64
+    "The largest payload permitted by the protocol"
+
+    def __bytes__(self):
+        """
+        The message as transmitted: the two-byte length followed
+        by the payload.
+
+        >>> bytes(GetBatteryLevel())
+        b'\\x02\\x00\\x00\\x0b'
+        """
+        buffer = bytearray(self.max_payload + 2)
+        return bytes(buffer[: self.encode_into(buffer)])
+
+    def encode_into(self, buffer, offset=0):
+        """
+        Pack the message as transmitted into buffer at offset,
+        returning the number of bytes written.
+        """
+        payload = self.payload
+        size = len(payload)
+        assert size <= self.max_payload
+        _length.pack_into(buffer, offset, size)
+        buffer[offset + 2 : offset + 2 + size] = payload
+        return size + 2
 
     def __len__(self):
         return len(self.payload)
@@ -97,19 +302,16 @@ class Message(metaclass=MetaMessage):
     @staticmethod
     def read(stream):
         "Read a message out of the data stream"
+        return FrameDecoder().read(stream)
 
-        # The first two characters in the stream indicate the length
-        #  of the message
-        len = struct.unpack('<H', stream.read(2))[0]
-
-        # The header of every message must contain two bytes
-        assert len >= 2
-
-        # read the rest of the message (can't be more than 64k)
-        payload = stream.read(len)
-
-        # read the command type and command byte
-        command_type, command = struct.unpack('<BB', payload[:2])
+    @staticmethod
+    def decode(payload):
+        """
+        Create a message of the appropriate type from a payload
+        (the portion of the message following the two-byte size).
+        """
+        # the header is the command type and command byte
+        command_type, command = payload[0], payload[1]
 
         # ascertain the reply class based on the header
         cls = Message.determine_reply_class(command_type, command)
@@ -134,6 +336,106 @@ class Message(metaclass=MetaMessage):
         return cls
 
 
+class FrameDecoder:
+    """
+    Incrementally decode messages from chunks of a byte stream,
+    without performing any I/O.
+
+    >>> decoder = FrameDecoder()
+    >>> frame = b'\\x05\\x00\\x02\\x0b\\x00\\x50\\x00'
+
+    Bytes may arrive in arbitrary chunks. Nothing is yielded until
+    a message is complete.
+
+    >>> list(decoder.feed(frame[:3]))
+    []
+    >>> decoder.needed
+    4
+
+    A chunk may complete one message and contain others.
+
+    >>> msgs = list(decoder.feed(frame[3:] + frame + frame[:1]))
+    >>> [type(msg).__name__ for msg in msgs]
+    ['BatteryResponse', 'BatteryResponse']
+    >>> decoder.needed
+    1
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """
+        Append data to the buffer and return an iterator of the messages
+        thereby completed. Messages not consumed from the iterator
+        remain buffered.
+        """
+        self._buffer += data
+        return self.messages()
+
+    @property
+    def needed(self):
+        """
+        The number of bytes required to complete the next message
+        (zero if a message is ready).
+        """
+        have = len(self._buffer)
+        if have < 2:
+            return 2 - have
+        (size,) = _length.unpack_from(self._buffer)
+        return max(size + 2 - have, 0)
+
+    def payloads(self):
+        "Generate the payloads of complete messages in the buffer"
+        buffer = self._buffer
+        while len(buffer) >= 2:
+            (size,) = _length.unpack_from(buffer)
+            # The header of every message must contain two bytes
+            if size < 2:
+                raise ValueError(f"Invalid message length {size}")
+            end = size + 2
+            if len(buffer) < end:
+                return
+            payload = bytes(buffer[2:end])
+            del buffer[:end]
+            yield payload
+
+    def messages(self):
+        "Generate complete messages in the buffer"
+        return map(Message.decode, self.payloads())
+
+    def read(self, stream, chunk_size=0):
+        """
+        Read from stream until a message is complete and return it.
+
+        Reads request only the bytes needed to complete a message unless
+        chunk_size allows reading ahead (for streams that return what
+        is available rather than block for the full amount).
+
+        >>> import io
+        >>> stream = io.BytesIO(b'\\x05\\x00\\x02\\x0b')
+        >>> FrameDecoder().read(stream)
+        Traceback (most recent call last):
+        ...
+        EOFError: Stream ended before message was complete
+        """
+        self.fill(stream, chunk_size)
+        return next(self.messages())
+
+    def fill(self, stream, chunk_size=0):
+        "Read from stream until a message is complete (see read)"
+        while self.needed:
+            data = stream.read(max(self.needed, chunk_size))
+            if not data:
+                raise EOFError("Stream ended before message was complete")
+            self._buffer += data
+
+
+def _input_port(value):
+    "The InputPort encoded as value"
+    return InputPort(value + 1)
+
+
 class Command(Message):
     """
     Base class for commands to be sent to a NXT device
@@ -151,14 +453,70 @@ class Command(Message):
         assert len(args) == len(self.fields)
         self.set(dict(zip(self.fields, args)))
 
+    @classmethod
+    def fast(cls, *args, **kwargs):
+        """
+        Construct the command as with the class, but trust that the
+        settings are valid, skipping validation both now and when the
+        command is encoded (though settings are still converted, as
+        an input port to its wire value). For commands built in a hot
+        loop from values known to be in range.
+
+        >>> msg = SetOutputState.fast(OutputPort.a, set_power=75, motor_on=True)
+        >>> bytes(msg) == bytes(SetOutputState(OutputPort.a, 75, True))
+        True
+        >>> isinstance(msg, SetOutputState)
+        True
+
+        Invalid settings are not detected (and may fail to encode or be
+        rejected by the brick).
+
+        >>> msg = SetOutputState.fast(OutputPort.all, turn_ratio=50)
+        """
+        return cls._trusting()(*args, **kwargs)
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _trusting(cls):
+        "A subclass of cls that converts but doesn't validate its settings"
+        attrs = dict(
+            __slots__=(),
+            __module__=cls.__module__,
+            __qualname__=cls.__qualname__,
+            __doc__=cls.__doc__,
+            validate_settings=cls.convert_settings,
+        )
+        return type(cls)(cls.__name__, (cls,), attrs)
+
     def set(self, dict):
         for attr, value in dict.items():
             setattr(self, attr, value)
         self.validate_settings()
 
     def validate_settings(self):
+        self.convert_settings()
+
+    def convert_settings(self):
+        "Convert the settings to the types they're encoded from"
         return
 
+    @classmethod
+    def from_payload(cls, payload):
+        """
+        Decode the command (as sent) from its payload, recovering the
+        settings from which it was constructed.
+
+        >>> msg = GetOutputState.from_payload(GetOutputState(OutputPort.b).payload)
+        >>> msg.port
+        1
+        """
+        return cls._from_fields(*cls._struct.unpack_from(payload, 2))
+
+    @classmethod
+    def _from_fields(cls, *values):
+        "Construct the command from the values of its fields as encoded"
+        return cls(*values)
+
     @property
     def command_type(self):
         return self._expect_reply_value | self._command_type
@@ -183,8 +541,36 @@ class Command(Message):
         # by default, validate the settings, then pack the fields
         # according to the structure.
         self.validate_settings()
-        values = map(lambda f: getattr(self, f), self.fields)
-        return struct.pack('<' + self.structure, *values)
+        if self._struct is None:
+            values = _values_getter(self.fields)(self)
+            return _compile(self.structure).pack(*values)
+        return self._struct.pack(*self._get_values(self))
+
+    def encode_into(self, buffer, offset=0):
+        """
+        Pack length, header, and telegram directly into buffer, without
+        assembling the intermediate payload.
+
+        >>> buffer = bytearray(8)
+        >>> GetOutputState(OutputPort.b).encode_into(buffer, 2)
+        5
+        >>> bytes(buffer)
+        b'\\x00\\x00\\x03\\x00\\x00\\x06\\x01\\x00'
+        """
+        frame = self._frame
+        if frame is None or type(self).get_telegram is not Command.get_telegram:
+            # structure is dynamic or the telegram is custom
+            return super().encode_into(buffer, offset)
+        self.validate_settings()
+        frame.pack_into(
+            buffer,
+            offset,
+            frame.size - 2,
+            self.command_type,
+            self.command,
+            *self._get_values(self),
+        )
+        return frame.size
 
 
 class StartProgram(Command):
@@ -201,7 +587,11 @@ class StartProgram(Command):
         self.validate_filename(self.filename)
 
     def get_telegram(self):
-        return self.filename + '\x00'
+        return self.filename.encode('ascii') + b'\x00'
+
+    @classmethod
+    def from_payload(cls, payload):
+        return cls(bytes(payload[2:]).rstrip(b'\x00').decode('ascii'))
 
 
 class SetOutputState(Command):
@@ -239,14 +629,25 @@ class SetOutputState(Command):
         run_state=RunState.idle,
         tacho_limit=0,  # run forever
     ):
+        values = vars()
+        values.pop('self')
+
+        self.set(values)
+
+    def validate_settings(self):
+        port = self.port
         assert port in OutputPort.values(), "Invalid output port %d" % port
-        assert -100 <= set_power <= 100, "Invalid power set point %s" % set_power
-        assert isinstance(motor_on, bool)
-        assert isinstance(use_brake, bool)
-        assert isinstance(use_regulation, bool)
+        assert -100 <= self.set_power <= 100, (
+            "Invalid power set point %s" % self.set_power
+        )
+        assert isinstance(self.motor_on, bool)
+        assert isinstance(self.use_brake, bool)
+        assert isinstance(self.use_regulation, bool)
+        regulation_mode = self.regulation_mode
         assert regulation_mode in RegulationMode.values(), (
             "Invalid regulation mode %s" % regulation_mode
         )
+        turn_ratio = self.turn_ratio
         assert -100 <= turn_ratio <= 100
         assert not (turn_ratio and regulation_mode != RegulationMode.motor_sync), (
             "Turn ratio is only valid when regulation_mode is motor_sync"
@@ -254,13 +655,10 @@ class SetOutputState(Command):
         assert not (turn_ratio and port == OutputPort.all), (
             "Turn ratio is not valid for 'all' output ports"
         )
-        assert run_state in RunState.values(), "Invalid run state %s" % run_state
-        assert tacho_limit >= 0, "Invalid Tachometer Limit %s" % tacho_limit
-
-        values = vars()
-        values.pop('self')
-
-        self.set(values)
+        assert self.run_state in RunState.values(), (
+            "Invalid run state %s" % self.run_state
+        )
+        assert self.tacho_limit >= 0, "Invalid Tachometer Limit %s" % self.tacho_limit
 
     @property
     def mode_byte(self):
@@ -278,13 +676,44 @@ class SetOutputState(Command):
         mode_byte = functools.reduce(operator.or_, mode_bits)
         return mode_byte
 
+    @classmethod
+    def _from_fields(cls, port, set_power, mode_byte, *settings):
+        "Recover the flags from the mode_byte"
+        return cls(
+            port,
+            set_power,
+            bool(mode_byte & OutputMode.motor_on),
+            bool(mode_byte & OutputMode.brake),
+            bool(mode_byte & OutputMode.regulated),
+            *settings,
+        )
+
 
 class Reply(Message):
-    "A simple status response"
+    """
+    A simple status response.
+
+    Fields are decoded from the payload only when read.
+
+    >>> reply = OutputState(bytes([2, 6, 0, 1]) + bytes(21))
+    >>> reply.port
+    1
+    >>> hasattr(reply, '__dict__')
+    False
+    """
 
+    lazy = True
     fields: Tuple[str, ...] = ('status',)
     structure = 'B'
 
+    def parse_payload(self):
+        if not self.lazy:
+            return super().parse_payload()
+        if len(self.payload) - 2 != self._struct.size:
+            log.warning("Payload does not match structure")
+            log.debug("Payload is %r", self.payload)
+            log.debug("Structure is %r", self.structure)
+
 
 class PlaySoundFile(Command):
     command = 0x2
@@ -294,6 +723,10 @@ class PlaySoundFile(Command):
     def validate_settings(self):
         assert isinstance(self.loop, bool)
 
+    @classmethod
+    def _from_fields(cls, loop, filename):
+        return cls(bool(loop), filename)
+
 
 class SetInputMode(Command):
     command = 0x5
@@ -301,10 +734,17 @@ class SetInputMode(Command):
     structure = 'BBB'
 
     def validate_settings(self):
-        self.port = InputPort(self.port)
+        self.convert_settings()
         assert self.type in SensorType.values()
         assert self.mode in SensorMode.values()
 
+    def convert_settings(self):
+        self.port = InputPort(self.port)
+
+    @classmethod
+    def _from_fields(cls, port, *values):
+        return cls(_input_port(port), *values)
+
 
 class OutputState(Reply):
     fields = (
@@ -366,9 +806,13 @@ class ResetInputScaledValue(Command):
     fields = ('port',)
     structure = 'B'
 
-    def validate_settings(self):
+    def convert_settings(self):
         self.port = InputPort(self.port)
 
+    @classmethod
+    def _from_fields(cls, port, *values):
+        return cls(_input_port(port), *values)
+
 
 class GetInputValues(Command):
     command = 0x7
@@ -376,9 +820,13 @@ class GetInputValues(Command):
     fields = ('port',)
     structure = 'B'
 
-    def validate_settings(self):
+    def convert_settings(self):
         self.port = InputPort(self.port)
 
+    @classmethod
+    def _from_fields(cls, port, *values):
+        return cls(_input_port(port), *values)
+
 
 class GetVersion(Command):
     expected_reply = Message
@@ -459,7 +907,10 @@ class MessageWrite(Command):
 
     @property
     def Zmessage(self):
-        return ''.join([self.message, '\x00'])
+        message = self.message
+        if isinstance(message, str):
+            message = message.encode('ascii')
+        return message + b'\x00'
 
     @property
     def message_len(self):
@@ -467,13 +918,18 @@ class MessageWrite(Command):
         return len(self.Zmessage)
 
     def validate_settings(self):
-        assert 0 <= self.box < 10, 'invalid box number %(box_number)s' % self.__dict__
+        assert 0 <= self.box < 10, 'invalid box number %s' % self.box_number
         assert self.message_len <= 0xFF
 
     @property
     def box(self):
         return self.box_number - 1
 
+    @classmethod
+    def from_payload(cls, payload):
+        box, length = payload[2], payload[3]
+        return cls(bytes(payload[4 : 4 + length - 1]), box + 1)
+
 
 class ResetMotorPosition(Command):
     """
@@ -493,6 +949,10 @@ class ResetMotorPosition(Command):
         values.pop('self')
         self.set(values)
 
+    @classmethod
+    def _from_fields(cls, port, relative):
+        return cls(port, bool(relative))
+
 
 class StopSoundPlayback(Command):
     command = 0xC
@@ -509,8 +969,12 @@ class LSGetStatus(Command):
     fields = ('port',)
     structure = 'B'
 
-    def validate_settings(self):
-        assert self.port in InputPort.values()
+    def convert_settings(self):
+        self.port = InputPort(self.port)
+
+    @classmethod
+    def _from_fields(cls, port, *values):
+        return cls(_input_port(port), *values)
 
 
 class LSWrite(Command):
@@ -526,13 +990,21 @@ class LSWrite(Command):
     def validate_settings(self):
         assert self.data_length <= 16
         assert self.response_length <= 16
-        assert self.port in OutputPort.values()
+        self.convert_settings()
+
+    def convert_settings(self):
+        self.port = InputPort(self.port)
 
     def __init__(self, port, data, response_length=0):
         values = vars()
         values.pop('self')
         self.set(values)
 
+    @classmethod
+    def from_payload(cls, payload):
+        port, length, response_length = payload[2:5]
+        return cls(_input_port(port), bytes(payload[5 : 5 + length]), response_length)
+
 
 class StatusResponse(Reply):
     pass
@@ -549,8 +1021,12 @@ class LSRead(Command):
     fields = ('port',)
     structure = 'B'
 
-    def validate_settings(self):
-        assert self.port in InputPort.values()
+    def convert_settings(self):
+        self.port = InputPort(self.port)
+
+    @classmethod
+    def _from_fields(cls, port, *values):
+        return cls(_input_port(port), *values)
 
 
 class MessageReadResponse(Reply):
@@ -559,17 +1035,25 @@ class MessageReadResponse(Reply):
 
 
 class MessageRead(Command):
+    """
+    >>> bytes(MessageRead(2))
+    b'\\x05\\x00\\x00\\x13\\x0b\\x01\\x01'
+    """
+
     expected_reply = MessageReadResponse
     command = 0x13
     fields = 'remote_box', 'local_box', 'remove'
     structure = 'BBB'
 
     def validate_settings(self):
-        assert 0 <= self.box < 10, 'invalid box number %(box_number)s' % self.__dict__
-        assert self.message_len <= 0xFF
+        assert 0 <= self.local_box < 10, 'invalid box number %s' % self.box_number
 
     remote_box = property(lambda self: self.local_box + 0xA)
     local_box = property(lambda self: self.box_number - 1)
 
     def __init__(self, box_number=1, remove=True):
-        self.set(box_number=box_number, remove=remove)
+        self.set(dict(box_number=box_number, remove=remove))
+
+    @classmethod
+    def _from_fields(cls, remote_box, local_box, remove):
+        return cls(local_box + 1, bool(remove))
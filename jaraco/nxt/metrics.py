@@ -0,0 +1,175 @@
+"""
+Instrumentation of the messages sent to and received from a device.
+
+Attach an Instrument to a device with ``Device.instrument(sink)``;
+each send and receive then reports Events to the sink, which may be a
+Snapshot (aggregating them in memory), a LoggingSink, or any callable.
+A device without an instrument pays only an attribute check.
+"""
+
+import collections
+import logging
+import math
+import time
+from typing import NamedTuple
+
+from . import messages
+
+
+class Event(NamedTuple):
+    """
+    Something measured on a device.
+
+    kind is one of 'sent', 'received', 'round_trip', 'read_wait',
+    'decode', or 'error'. name is the message class (or exception
+    type for errors).
+    """
+
+    kind: str
+    name: str
+    nbytes: int = 0
+    duration: float = 0.0
+
+
+class Instrument:
+    """
+    Translate the activity of a device into events, matching each
+    reply to the earliest outstanding command with the same command
+    byte to measure its round trip.
+    """
+
+    def __init__(self, sink):
+        self.sink = sink
+        self._outstanding = collections.defaultdict(collections.deque)
+
+    def sent(self, message, nbytes):
+        name = type(message).__name__
+        self.sink(Event('sent', name, nbytes))
+        if message.expected_reply:
+            self._outstanding[message.command].append((time.perf_counter(), name))
+
+    def sent_frames(self, data):
+        "Report the frames in data, encoded in advance and sent together"
+        view = memoryview(data)
+        while view:
+            size = messages._length.unpack_from(view)[0] + 2
+            command_type, command = view[2], view[3]
+            cls = messages.Message._messages.get(command)
+            name = cls.__name__ if cls else hex(command)
+            self.sink(Event('sent', name, size))
+            if cls and cls.expected_reply and not command_type & 0x80:
+                self._outstanding[command].append((time.perf_counter(), name))
+            view = view[size:]
+
+    def received(self, message, wait, decode):
+        now = time.perf_counter()
+        self.sink(Event('received', type(message).__name__, len(message) + 2))
+        self.sink(Event('read_wait', type(message).__name__, duration=wait))
+        self.sink(Event('decode', type(message).__name__, duration=decode))
+        outstanding = self._outstanding.get(message.payload[1])
+        if outstanding:
+            start, name = outstanding.popleft()
+            self.sink(Event('round_trip', name, duration=now - start))
+
+    def error(self, exc):
+        self.sink(Event('error', type(exc).__name__))
+        if isinstance(exc, (TimeoutError, EOFError)):
+            # the replies awaited may never come; rather than match
+            #  later replies to commands long past, forget them
+            self._outstanding.clear()
+
+
+class Histogram:
+    """
+    Counts of durations in buckets doubling from one microsecond.
+
+    >>> hist = Histogram()
+    >>> for duration in (0.0000005, 0.003, 0.0031, 0.2):
+    ...     hist.add(duration)
+    >>> hist.count, round(hist.max, 4)
+    (4, 0.2)
+    >>> hist.buckets()
+    {1e-06: 1, 0.004096: 2, 0.262144: 1}
+    """
+
+    def __init__(self):
+        self.counts = collections.Counter()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration):
+        exponent = max(math.ceil(math.log2(max(duration, 1e-9) * 1e6)), 0)
+        self.counts[exponent] += 1
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    def buckets(self):
+        "Map the upper bound (in seconds) of each bucket to its count"
+        return {2**exp / 1e6: self.counts[exp] for exp in sorted(self.counts)}
+
+    def summary(self):
+        return dict(
+            count=self.count,
+            mean=self.total / self.count if self.count else 0.0,
+            max=self.max,
+            buckets=self.buckets(),
+        )
+
+
+class Snapshot:
+    """
+    A sink aggregating events in memory.
+
+    >>> snap = Snapshot()
+    >>> snap(Event('sent', 'GetBatteryLevel', 4))
+    >>> snap(Event('round_trip', 'GetBatteryLevel', duration=0.02))
+    >>> snap(Event('error', 'TimeoutError'))
+    >>> stats = snap.snapshot()
+    >>> stats['counts']
+    {'sent': {'GetBatteryLevel': 1}, 'error': {'TimeoutError': 1}}
+    >>> stats['bytes']
+    {'sent': 4}
+    >>> stats['durations']['round_trip']['GetBatteryLevel']['count']
+    1
+    """
+
+    counted = {'sent', 'received', 'error'}
+
+    def __init__(self):
+        self.counts = collections.defaultdict(collections.Counter)
+        self.bytes = collections.Counter()
+        self.durations = collections.defaultdict(
+            lambda: collections.defaultdict(Histogram)
+        )
+
+    def __call__(self, event):
+        if event.kind in self.counted:
+            self.counts[event.kind][event.name] += 1
+            if event.nbytes:
+                self.bytes[event.kind] += event.nbytes
+        else:
+            self.durations[event.kind][event.name].add(event.duration)
+
+    def snapshot(self):
+        "The aggregates as plain data"
+        return dict(
+            counts={kind: dict(counts) for kind, counts in self.counts.items()},
+            bytes=dict(self.bytes),
+            durations={
+                kind: {name: hist.summary() for name, hist in hists.items()}
+                for kind, hists in self.durations.items()
+            },
+        )
+
+
+class LoggingSink:
+    "A sink logging each event"
+
+    def __init__(self, logger=logging.getLogger(__name__), level=logging.DEBUG):
+        self.logger = logger
+        self.level = level
+
+    def __call__(self, event):
+        self.logger.log(self.level, "%s", event)
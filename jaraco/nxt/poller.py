@@ -0,0 +1,162 @@
+"""
+Poll several sensors, each at its own rate, over one device.
+
+>>> from jaraco.nxt import simulator
+>>> with simulator.Simulator() as sim:
+...     poller = SensorPoller(sim.connect())
+...     touch = poller.subscribe(
+...         1, messages.SensorType.switch, messages.SensorMode.boolean, rate=100)
+...     sample = next(poller.samples())
+>>> sample.port, sample.values.scaled_value
+(InputPort(1), 0)
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Callable
+from typing import NamedTuple
+
+from . import messages
+from ._enum import InputPort
+
+
+class Subscription(NamedTuple):
+    port: InputPort
+    type: int
+    mode: int
+    rate: float
+    "Samples per second"
+    callback: Callable[[Sample], None] | None = None
+
+
+class Sample(NamedTuple):
+    port: InputPort
+    time: float
+    "The time (by the poller's clock) the request was sent"
+    values: messages.InputValues
+
+
+class SensorPoller:
+    """
+    Poll the sensors subscribed, each at its rate, requesting input
+    values in order of their deadlines and sending together (in one
+    round trip) the requests falling due at once.
+
+    If budget is given, the rates are scaled down proportionally as
+    needed to keep the total requests per second within it.
+    """
+
+    def __init__(self, device, budget=None, clock=time.monotonic, sleep=time.sleep):
+        self.device = device
+        self.budget = budget
+        self.clock = clock
+        self.sleep = sleep
+        self.subscriptions = {}
+        self._schedule = []
+        self._order = itertools.count()
+        self._configured = set()
+        self._stopped = threading.Event()
+
+    def subscribe(self, port, type, mode, rate, callback=None):
+        """
+        Poll the sensor on port (configured with the type and mode)
+        rate times per second, passing each sample to callback (if
+        any). Replaces any subscription to the same port.
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, not {rate}")
+        port = InputPort(port)
+        subscription = Subscription(port, type, mode, rate, callback)
+        self.subscriptions[port] = subscription
+        self._configured.discard(port)
+        heapq.heappush(self._schedule, (self.clock(), next(self._order), subscription))
+        return subscription
+
+    def unsubscribe(self, port):
+        del self.subscriptions[InputPort(port)]
+
+    @property
+    def scale(self):
+        "The factor by which the rates are scaled to keep within budget"
+        total = sum(sub.rate for sub in self.subscriptions.values())
+        if not self.budget or total <= self.budget:
+            return 1
+        return self.budget / total
+
+    def _configure(self):
+        "Set the input mode of newly-subscribed ports"
+        pending = [
+            messages.SetInputMode(sub.port, sub.type, sub.mode)
+            for sub in self.subscriptions.values()
+            if sub.port not in self._configured
+        ]
+        if pending:
+            self.device.request_many(pending)
+            self._configured.update(command.port for command in pending)
+
+    def _due(self):
+        """
+        Wait until the earliest deadline, then pop and return the
+        current subscriptions due with their deadlines.
+        """
+        deadline = self._schedule[0][0]
+        remaining = deadline - self.clock()
+        if remaining > 0:
+            self.sleep(remaining)
+        now = self.clock()
+        due = []
+        while self._schedule and self._schedule[0][0] <= now:
+            deadline, _, sub = heapq.heappop(self._schedule)
+            if self.subscriptions.get(sub.port) is sub:
+                due.append((deadline, sub))
+        return due
+
+    def poll(self):
+        """
+        Wait for the next requests to fall due, then send them and
+        return the resulting samples (after passing each to the
+        callback of its subscription).
+        """
+        self._configure()
+        if not self._schedule:
+            return []
+        due = self._due()
+        sent = self.clock()
+        replies = self.device.request_many(
+            messages.GetInputValues(sub.port) for _, sub in due
+        )
+        scale = self.scale
+        samples = []
+        for (deadline, sub), values in zip(due, replies):
+            # keep to the schedule, but skip deadlines already missed
+            #  rather than sending a burst to catch up
+            period = 1 / (sub.rate * scale)
+            next_deadline = max(deadline + period, sent)
+            heapq.heappush(self._schedule, (next_deadline, next(self._order), sub))
+            sample = Sample(sub.port, sent, values)
+            if sub.callback is not None:
+                sub.callback(sample)
+            samples.append(sample)
+        return samples
+
+    def samples(self):
+        "Generate samples as they arrive, until stopped"
+        while not self._stopped.is_set():
+            yield from self.poll()
+
+    def run(self, duration=None):
+        """
+        Poll (delivering samples to the callbacks) for duration seconds,
+        or until stopped.
+        """
+        end = None if duration is None else self.clock() + duration
+        while not self._stopped.is_set() and (end is None or self.clock() < end):
+            self.poll()
+
+    def stop(self):
+        "Stop polling (from another thread or a callback)"
+        self._stopped.set()
@@ -0,0 +1,89 @@
+"""
+Communicate with many bricks at once.
+"""
+
+import collections.abc
+from concurrent import futures
+
+
+class BrickPool(collections.abc.Mapping):
+    """
+    Devices connected to many bricks, keyed by name or address.
+
+    Each brick's requests run on its own worker thread, so requests
+    to different bricks proceed in parallel while those to the same
+    brick are sent in order.
+    """
+
+    def __init__(self, devices=()):
+        self._devices = {}
+        self._workers = {}
+        for key, device in dict(devices).items():
+            self.add(key, device)
+
+    def add(self, key, device):
+        if key in self._devices:
+            raise KeyError(f"Brick {key!r} is already in the pool")
+        self._devices[key] = device
+        self._workers[key] = futures.ThreadPoolExecutor(
+            1, thread_name_prefix=f'nxt-{key}'
+        )
+
+    def remove(self, key):
+        "Remove the brick from the pool (without closing it)"
+        self._workers.pop(key).shutdown()
+        return self._devices.pop(key)
+
+    def __getitem__(self, key):
+        return self._devices[key]
+
+    def __iter__(self):
+        return iter(self._devices)
+
+    def __len__(self):
+        return len(self._devices)
+
+    def submit(self, key, command):
+        "Request command of the brick, returning a Future of the reply"
+        return self._workers[key].submit(self._devices[key].request, command)
+
+    def gather(self, commands, timeout=None):
+        """
+        Request of each brick its command (given as a mapping of key to
+        command) in parallel. Generate (key, result) pairs in the order
+        the requests complete, where the result is the reply or the
+        exception the request raised, so that one brick failing
+        doesn't lose the replies of the others.
+
+        A brick whose request hasn't completed within timeout seconds
+        has a TimeoutError as its result.
+        """
+        pending = {self.submit(key, command): key for key, command in commands.items()}
+        return self._results(pending, timeout)
+
+    @staticmethod
+    def _results(pending, timeout):
+        "Generate (key, result) as the pending futures complete"
+        try:
+            for future in futures.as_completed(pending, timeout):
+                key = pending.pop(future)
+                yield key, future.exception() or future.result()
+        except futures.TimeoutError:
+            for future, key in pending.items():
+                future.cancel()
+                yield key, TimeoutError(f"Brick {key!r} didn't reply in time")
+
+    def broadcast(self, command, timeout=None):
+        "Request command of every brick (see gather)"
+        return self.gather(dict.fromkeys(self, command), timeout)
+
+    def close(self):
+        "Stop the workers and close the devices"
+        for key in list(self):
+            self.remove(key).close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,6 +1,16 @@
+import math
+import statistics
+import threading
 import time
+from typing import NamedTuple
 
-from .messages import SetOutputState, GetBatteryLevel, OutputPort, RunState
+from .messages import (
+    SetOutputState,
+    GetBatteryLevel,
+    GetOutputState,
+    OutputPort,
+    RunState,
+)
 
 
 def get_voltage(conn):
@@ -20,15 +30,211 @@ def get_port(port, cls):
 def cycle_motor(conn, port):
     "Turn the motor one direction, then the other, then stop it"
     port = get_port(port, OutputPort)
-    cmd = SetOutputState(port, motor_on=True, set_power=60, run_state=RunState.running)
-    conn.send(cmd)
-    time.sleep(2)
-    cmd = SetOutputState(port, motor_on=True, set_power=-60, run_state=RunState.running)
-    conn.send(cmd)
-    time.sleep(2)
-    cmd = SetOutputState(port)
-    conn.send(cmd)
+    sequence = MotionSequence()
+    sequence.send(
+        0,
+        SetOutputState(port, motor_on=True, set_power=60, run_state=RunState.running),
+    )
+    sequence.send(
+        2,
+        SetOutputState(port, motor_on=True, set_power=-60, run_state=RunState.running),
+    )
+    sequence.send(4, SetOutputState(port))
+    sequence.run(conn)
 
 
 def cycle_motor_a(conn):
     cycle_motor(conn, 'a')
+
+
+moving = RunState.rampup, RunState.running
+
+
+def _time_remaining(first, now, state):
+    """
+    Estimate the seconds until the motor reaches its tacho limit from
+    its rate since it was first observed (at time, count), or infinity
+    if it can't be estimated.
+    """
+    start, count = first
+    travelled = abs(state.tacho_count - count)
+    if not state.tacho_limit or not travelled:
+        return math.inf
+    rate = travelled / (now - start)
+    # the motor may have moved before it was first observed, so this
+    #  errs long
+    return max(state.tacho_limit - travelled, 0) / rate
+
+
+def await_motion(
+    conn,
+    ports,
+    timeout=None,
+    min_interval=0.01,
+    max_interval=0.25,
+    clock=time.monotonic,
+    sleep=time.sleep,
+):
+    """
+    Wait for the motors on ports to finish moving (their run state to
+    leave running), returning the final OutputState of each by port.
+
+    Rather than polling at a fixed interval, estimate when each motor
+    will reach its tacho limit from its observed rate, and poll
+    sparsely at first (every max_interval at most) and more densely
+    (down to every min_interval) as that time nears.
+
+    Raise TimeoutError if the motors are still moving after timeout
+    seconds.
+    """
+    ports = [get_port(port, OutputPort) for port in ports]
+    deadline = None if timeout is None else clock() + timeout
+    first_seen = {}
+    finished = {}
+    while True:
+        now = clock()
+        pending = [port for port in ports if port not in finished]
+        states = conn.request_many(GetOutputState(port) for port in pending)
+        remaining = []
+        for port, state in zip(pending, states):
+            if state.run_state not in moving:
+                finished[port] = state
+                continue
+            first = first_seen.setdefault(port, (now, state.tacho_count))
+            remaining.append(_time_remaining(first, now, state))
+        if len(finished) == len(ports):
+            return finished
+        interval = min(max(min(remaining) / 2, min_interval), max_interval)
+        if deadline is not None:
+            if now >= deadline:
+                raise TimeoutError(f"Motors still moving after {timeout} seconds")
+            interval = min(interval, deadline - now)
+        sleep(interval)
+
+
+class Jitter(NamedTuple):
+    "Statistics of the lateness (in seconds) of the steps of a run"
+
+    count: int
+    mean: float
+    stdev: float
+    worst: float
+
+
+class MotionSequence:
+    """
+    A timeline of commands, each sent at an offset (in seconds) from
+    the start of the run or from the completion of the latest wait
+    condition.
+
+    The commands are encoded when added, so a run (or many) incurs no
+    encoding, and they're dispatched from a dedicated thread against
+    absolute deadlines on a monotonic clock, so delays don't
+    accumulate from step to step.
+
+    >>> from jaraco.nxt.simulator import Simulator
+    >>> forward = SetOutputState(
+    ...     OutputPort.a, 100, True, run_state=RunState.running, tacho_limit=90)
+    >>> sequence = MotionSequence()
+    >>> sequence.send(0, forward)
+    >>> sequence.wait(lambda conn: await_motion(conn, [OutputPort.a]))
+    >>> sequence.send(0.01, SetOutputState(OutputPort.a))
+    >>> with Simulator() as sim:
+    ...     jitter = sequence.run(sim.connect())
+    >>> jitter.count
+    2
+    """
+
+    spin = 0.002
+    "Seconds before each deadline to stop sleeping and spin"
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.steps = []
+        self.lateness = []
+        self._thread = None
+        self._error = None
+        self._stopped = threading.Event()
+
+    def send(self, offset, *commands):
+        """
+        Send the commands together at offset (written together with
+        ``Device.write_frames``). Commands may not solicit replies.
+        """
+        for command in commands:
+            if command.expected_reply:
+                raise ValueError(f"{type(command).__name__} solicits a reply")
+        self.steps.append((offset, b''.join(map(bytes, commands))))
+
+    def wait(self, condition):
+        """
+        Call condition (with the device) and wait for it to return
+        before proceeding. Subsequent offsets are from its return.
+        """
+        self.steps.append((None, condition))
+
+    def start(self, conn):
+        "Run the sequence on conn in a dedicated thread"
+        self.lateness = []
+        self._error = None
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._dispatch, args=(conn,), name='nxt-motion', daemon=True
+        )
+        self._thread.start()
+
+    def join(self, timeout=None):
+        """
+        Wait for the run to finish, raising any error it encountered,
+        and return the statistics of its timing. Raise TimeoutError
+        if the run doesn't finish within timeout seconds.
+        """
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            raise TimeoutError("Motion sequence still running")
+        if self._error is not None:
+            raise self._error
+        return self.jitter()
+
+    def run(self, conn):
+        "Run the sequence, returning the statistics of its timing"
+        self.start(conn)
+        return self.join()
+
+    def stop(self):
+        "Abandon the run before the next step"
+        self._stopped.set()
+
+    def jitter(self):
+        "Statistics of the timing of the latest run"
+        lateness = self.lateness
+        if not lateness:
+            return Jitter(0, 0.0, 0.0, 0.0)
+        stdev = statistics.pstdev(lateness)
+        return Jitter(len(lateness), statistics.fmean(lateness), stdev, max(lateness))
+
+    def _dispatch(self, conn):
+        try:
+            base = self.clock()
+            for offset, action in self.steps:
+                if offset is None:
+                    action(conn)
+                    base = self.clock()
+                    continue
+                deadline = base + offset
+                self._wait_until(deadline)
+                if self._stopped.is_set():
+                    return
+                sent = self.clock()
+                conn.write_frames(action)
+                self.lateness.append(sent - deadline)
+        except Exception as exc:
+            self._error = exc
+
+    def _wait_until(self, deadline):
+        "Sleep until shortly before deadline, then spin until it"
+        remaining = deadline - self.clock()
+        if remaining > self.spin:
+            self._stopped.wait(remaining - self.spin)
+        while self.clock() < deadline and not self._stopped.is_set():
+            pass
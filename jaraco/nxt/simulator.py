@@ -0,0 +1,427 @@
+"""
+A simulated NXT brick, speaking the wire protocol over a local socket
+or pseudo-terminal, for testing and benchmarking without hardware.
+
+>>> with Simulator() as sim:
+...     dev = sim.connect()
+...     dev.request(messages.GetBatteryLevel()).millivolts
+7800
+"""
+
+import contextlib
+import functools
+import math
+import os
+import queue
+import random
+import socket
+import struct
+import threading
+import time
+
+from . import SocketDevice, messages
+from ._enum import CommandTypes, OutputMode, OutputPort, RunState, SensorMode
+
+suppress_reply = 0x80
+
+
+class Status:
+    "Status codes returned by the brick"
+
+    success = 0x00
+    pending = 0x20
+    mailbox_empty = 0x40
+    no_program = 0xEC
+    unknown_command = 0xBE
+    bad_port = 0xF0
+
+
+class Motor:
+    """
+    An output port, whose counts advance with time while running
+    until the tacho limit (if any) is reached.
+    """
+
+    full_speed = 900
+    "Degrees per second at full power"
+
+    def __init__(self, now):
+        self.power = 0
+        self.mode = 0
+        self.regulation_mode = 0
+        self.turn_ratio = 0
+        self.run_state = RunState.idle
+        self.tacho_limit = 0
+        self.tacho_count = 0.0
+        self.block_tacho_count = 0.0
+        self.rotation_count = 0.0
+        self.goal_start = 0.0
+        self.updated = now
+
+    @property
+    def moving(self):
+        return (
+            self.mode & OutputMode.motor_on
+            and self.run_state != RunState.idle
+            and self.power
+        )
+
+    def advance(self, now):
+        "Advance the counts to time now"
+        elapsed, self.updated = now - self.updated, now
+        if not self.moving:
+            return
+        delta = self.power * self.full_speed / 100 * elapsed
+        if self.tacho_limit:
+            travelled = abs(self.tacho_count - self.goal_start)
+            remaining = self.tacho_limit - travelled
+            if abs(delta) >= remaining:
+                delta = math.copysign(remaining, delta)
+                self.run_state = RunState.idle
+                self.power = 0
+        self.tacho_count += delta
+        self.block_tacho_count += delta
+        self.rotation_count += delta
+
+    def set(self, values, now):
+        self.advance(now)
+        self.power = values['set_power']
+        self.mode = values['mode_byte']
+        self.regulation_mode = values['regulation_mode']
+        self.turn_ratio = values['turn_ratio']
+        self.run_state = values['run_state']
+        self.tacho_limit = values['tacho_limit']
+        self.goal_start = self.tacho_count
+
+    def reset(self, relative):
+        if relative:
+            self.block_tacho_count = 0.0
+        else:
+            self.rotation_count = 0.0
+
+    def state(self):
+        return (
+            self.power,
+            self.mode,
+            self.regulation_mode,
+            self.turn_ratio,
+            self.run_state,
+            self.tacho_limit,
+            int(self.tacho_count),
+            int(self.block_tacho_count),
+            int(self.rotation_count),
+        )
+
+
+class Sensor:
+    """
+    An input port. Set raw to simulate a reading; the other values
+    are derived from it according to the mode.
+    """
+
+    def __init__(self):
+        self.type = 0
+        self.mode = 0
+        self.raw = 1023
+        self.ls_data = b''
+
+    @property
+    def scaled(self):
+        mode = self.mode & SensorMode.mode_mask
+        if mode == SensorMode.boolean:
+            return int(self.raw < 512)
+        if mode == SensorMode.pct_full_scale:
+            return (1023 - self.raw) * 100 // 1023
+        return self.raw
+
+    def ls_respond(self, data, response_length):
+        "The response of a low-speed (I2C) device to data written"
+        return bytes(response_length)
+
+
+class Brick:
+    """
+    The modeled state of a brick, answering commands as the brick
+    would.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        now = clock()
+        self.millivolts = 7800
+        self.sleep_timeout = 10 * 60 * 1000
+        self.outputs = [Motor(now) for port in range(3)]
+        self.inputs = [Sensor() for port in range(4)]
+        self.inbox = [[] for box in range(10)]
+        self.outbox = [[] for box in range(10)]
+        self.program = None
+        self.log = []
+
+    def handle(self, payload):
+        """
+        Handle the command in the payload, returning the reply payload
+        or None if no reply was solicited.
+        """
+        command_type, command = payload[0], payload[1]
+        cls = messages.Message._messages.get(command)
+        handler = getattr(self, 'on_' + cls.__name__, None) if cls else None
+        if handler is None:
+            telegram = bytes([Status.unknown_command])
+        else:
+            self.log.append(cls)
+            try:
+                telegram = handler(self._decode(cls, payload))
+            except (LookupError, ValueError):
+                # a port out of range (or all ports, where only one
+                #  is allowed), which the brick rejects
+                telegram = self._error(cls, Status.bad_port)
+        if command_type & suppress_reply:
+            return None
+        return bytes([CommandTypes.reply, command]) + telegram
+
+    @staticmethod
+    def _decode(cls, payload):
+        "Decode the fields of a command payload as a dict"
+        if not cls.structure and cls.fields:
+            # the telegram is the sole field
+            (field,) = cls.fields
+            return {field: payload[2:].rstrip(b'\x00')}
+        if cls._struct is None:
+            # the dynamic structures end with the data, whose length
+            #  is the second field
+            length = payload[3]
+            codec = struct.Struct('<' + 'B' * (len(cls.fields) - 1) + '%ds' % length)
+        else:
+            codec = cls._struct
+        return dict(zip(cls.fields, codec.unpack_from(payload, 2)))
+
+    @staticmethod
+    def _status(status=Status.success):
+        return bytes([status])
+
+    @staticmethod
+    def _error(cls, status):
+        "A reply to a command of cls bearing status and no values"
+        reply = cls.expected_reply
+        size = reply._struct.size if reply and reply._struct else 1
+        return bytes([status]) + bytes(size - 1)
+
+    def _outputs(self, port):
+        now = self.clock()
+        ports = range(3) if port == OutputPort.all else [port]
+        for motor in map(self.outputs.__getitem__, ports):
+            motor.advance(now)
+            yield motor
+
+    def on_GetBatteryLevel(self, values):
+        return struct.pack('<BH', Status.success, self.millivolts)
+
+    def on_KeepAlive(self, values):
+        return struct.pack('<BL', Status.success, self.sleep_timeout)
+
+    def on_GetVersion(self, values):
+        return struct.pack('<BBBBB', Status.success, 124, 1, 28, 1)
+
+    def on_GetInfo(self, values):
+        name = b'NXT'
+        return struct.pack('<B15s6sLL', Status.success, name, bytes(6), 0, 0)
+
+    def on_StartProgram(self, values):
+        self.program = values.get('filename')
+        return self._status()
+
+    def on_StopSoundPlayback(self, values):
+        return self._status()
+
+    def on_PlayTone(self, values):
+        return self._status()
+
+    def on_PlaySoundFile(self, values):
+        return self._status()
+
+    def on_GetCurrentProgramName(self, values):
+        if self.program is None:
+            return struct.pack('<B20s', Status.no_program, b'')
+        return struct.pack('<B20s', Status.success, self.program)
+
+    def on_SetOutputState(self, values):
+        now = self.clock()
+        ports = range(3) if values['port'] == OutputPort.all else [values['port']]
+        for port in ports:
+            self.outputs[port].set(values, now)
+        return self._status()
+
+    def on_GetOutputState(self, values):
+        port = values['port']
+        (motor,) = self._outputs(port)
+        return struct.pack('<BBbBBbBLlll', Status.success, port, *motor.state())
+
+    def on_ResetMotorPosition(self, values):
+        for motor in self._outputs(values['port']):
+            motor.reset(values['relative'])
+        return self._status()
+
+    def on_SetInputMode(self, values):
+        sensor = self.inputs[values['port']]
+        sensor.type = values['type']
+        sensor.mode = values['mode']
+        return self._status()
+
+    def on_GetInputValues(self, values):
+        port = values['port']
+        sensor = self.inputs[port]
+        return struct.pack(
+            '<BBBBBBHHhh',
+            Status.success,
+            port,
+            1,
+            0,
+            sensor.type,
+            sensor.mode,
+            sensor.raw,
+            sensor.raw,
+            sensor.scaled,
+            sensor.raw,
+        )
+
+    def on_ResetInputScaledValue(self, values):
+        return self._status()
+
+    def on_MessageWrite(self, values):
+        message = values['Zmessage'].rstrip(b'\x00')
+        self.inbox[values['box']].append(message)
+        return self._status()
+
+    def on_MessageRead(self, values):
+        remote_box = values['remote_box']
+        boxes = self.outbox if remote_box >= 10 else self.inbox
+        box = boxes[remote_box % 10]
+        if not box:
+            return struct.pack('<BB60p', Status.mailbox_empty, values['local_box'], b'')
+        message = box.pop(0) if values['remove'] else box[0]
+        return struct.pack('<BB60p', Status.success, values['local_box'], message)
+
+    def on_LSWrite(self, values):
+        sensor = self.inputs[values['port']]
+        sensor.ls_data = sensor.ls_respond(values['data'], values['response_length'])
+        return self._status()
+
+    def on_LSGetStatus(self, values):
+        ready = len(self.inputs[values['port']].ls_data)
+        return struct.pack('<BB', Status.success, ready)
+
+    def on_LSRead(self, values):
+        sensor = self.inputs[values['port']]
+        data, sensor.ls_data = sensor.ls_data, b''
+        return struct.pack('<B17p', Status.success, data)
+
+
+def _write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+class Simulator:
+    """
+    Serve a Brick over a byte stream, delaying each reply by latency
+    seconds, plus or minus up to jitter seconds (reproducibly, given a
+    seed).
+
+    Replies are delivered in order, each no sooner than its delay after
+    the packet bearing its command was received, so commands sent
+    together (pipelined) incur the latency once rather than for each.
+    """
+
+    def __init__(self, brick=None, latency=0, jitter=0, seed=None):
+        self.brick = brick or Brick()
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self._queues = []
+        self._threads = []
+        self._closers = []
+
+    def connect(self):
+        "Serve over a socket pair, returning a device connected to it"
+        client, server = socket.socketpair()
+        self._closers += [
+            client.close,
+            server.close,
+            functools.partial(server.shutdown, socket.SHUT_RDWR),
+        ]
+        self._start(server.recv, server.sendall)
+        return SocketDevice(client)
+
+    def open_pty(self):
+        """
+        Serve over a pseudo-terminal, returning the path of the
+        terminal to connect (as with Connection(path)).
+        """
+        import tty
+
+        controller, terminal = os.openpty()
+        tty.setraw(terminal)
+        self._closers += [
+            functools.partial(os.close, terminal),
+            functools.partial(os.close, controller),
+        ]
+        self._start(
+            functools.partial(os.read, controller),
+            functools.partial(_write_all, controller),
+        )
+        return os.ttyname(terminal)
+
+    def _start(self, read, write):
+        "Serve a connection, with its own queue of replies"
+        replies = queue.Queue()
+        reader = threading.Thread(target=self._serve, args=(read, replies), daemon=True)
+        writer = threading.Thread(
+            target=self._deliver, args=(write, replies), daemon=True
+        )
+        self._queues.append(replies)
+        self._threads += [reader, writer]
+        reader.start()
+        writer.start()
+
+    def _delay(self):
+        return max(self.latency + self.random.uniform(-self.jitter, self.jitter), 0)
+
+    def _serve(self, read, replies):
+        decoder = messages.FrameDecoder()
+        with contextlib.suppress(OSError):
+            while data := read(4096):
+                due = time.monotonic() + self._delay()
+                decoder.feed(data)
+                answers = filter(None, map(self.brick.handle, decoder.payloads()))
+                for reply in answers:
+                    replies.put((due, struct.pack('<H', len(reply)) + reply))
+        replies.put(None)
+
+    def _deliver(self, write, replies):
+        with contextlib.suppress(OSError):
+            while item := replies.get():
+                due, frame = item
+                remaining = due - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+                write(frame)
+
+    def close(self):
+        "Close the connections and wait for the threads serving them"
+        for close in reversed(self._closers):
+            with contextlib.suppress(OSError):
+                close()
+        self._closers.clear()
+        for replies in self._queues:
+            replies.put(None)
+        self._queues.clear()
+        for thread in self._threads:
+            thread.join(timeout=1)
+        self._threads.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,162 @@
+"""
+Bounded stores of recent telemetry (replies such as ``InputValues``
+and ``OutputState``) in preallocated, array-backed columns.
+
+>>> store = TelemetryStore(capacity=4)
+>>> payload = bytes([2, 7, 0, 0, 1, 0, 1, 0x20, 0, 0, 0, 0, 0, 0, 0, 0])
+>>> for time in range(6):
+...     store.append(messages.InputValues(payload), timestamp=time)
+>>> ring = store[messages.InputValues, messages.InputPort(1)]
+>>> window = ring.window()
+>>> window.start, window.stop
+(2, 6)
+>>> [list(times) for times, columns in window.segments]
+[[2.0, 3.0], [4.0, 5.0]]
+>>> window.column('mode').tolist()
+[32, 32, 32, 32]
+"""
+
+import array
+import time
+from typing import NamedTuple
+
+from . import messages
+
+_typecodes = dict(b='b', B='B', h='h', H='H', i='i', I='I', l='i', L='I', q='q', Q='Q')
+"Array typecodes for struct codes (of the same size, as struct packs them)"
+
+
+class Window(NamedTuple):
+    """
+    The records with sequence numbers in [start, stop), as one or two
+    segments (two where the records wrap around the end of the ring).
+    Each segment is a pair of the timestamps and a dict of columns by
+    field, all memoryviews into the ring.
+    """
+
+    start: int
+    stop: int
+    segments: list
+
+    def column(self, field):
+        "The values of field (copied into one array)"
+        typecode = self.segments[0][1][field].format if self.segments else 'B'
+        result = array.array(typecode)
+        for _, columns in self.segments:
+            result.frombytes(columns[field].cast('B'))
+        return result
+
+
+class Ring:
+    """
+    The most recent capacity records of replies of cls, in columns
+    preallocated for the timestamp and each field.
+
+    Records are appended by one producer; any number of readers may
+    take windows concurrently without locks. The producer writes a
+    record before publishing it by advancing ``count``, so a window
+    never includes a record partly written; but a window's views are
+    live, so a reader should confirm with ``intact`` that the records
+    weren't overwritten while it read them.
+    """
+
+    def __init__(self, cls, capacity):
+        if cls._struct is None:
+            raise TypeError(f"{cls.__name__} has no fixed structure")
+        self.cls = cls
+        self.capacity = capacity
+        self.count = 0
+        "The number of records ever appended (the next sequence number)"
+        formats = [format for format, offset in messages._layout(cls.structure)]
+        try:
+            typecodes = [_typecodes[format] for format in formats]
+        except KeyError:
+            raise TypeError(f"{cls.__name__} has fields that aren't numbers") from None
+        self.times = array.array('d', bytes(8 * capacity))
+        self.columns = {
+            field: array.array(
+                typecode, bytes(capacity * array.array(typecode).itemsize)
+            )
+            for field, typecode in zip(cls.fields, typecodes)
+        }
+        self._columns = list(self.columns.values())
+        self._views = (
+            memoryview(self.times),
+            {field: memoryview(column) for field, column in self.columns.items()},
+        )
+
+    def append(self, reply, timestamp=None):
+        "Record the reply (received at timestamp, by default now)"
+        values = self.cls._struct.unpack_from(reply.payload, 2)
+        index = self.count % self.capacity
+        self.times[index] = time.monotonic() if timestamp is None else timestamp
+        for column, value in zip(self._columns, values):
+            column[index] = value
+        self.count += 1
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    @property
+    def first(self):
+        "The sequence number of the oldest record retained"
+        return max(self.count - self.capacity, 0)
+
+    def window(self, start=None, stop=None):
+        """
+        The records with sequence numbers in [start, stop) (by default,
+        all those retained) that are still retained.
+        """
+        stop = self.count if stop is None else min(stop, self.count)
+        start = min(max(self.first if start is None else start, self.first), stop)
+        times, columns = self._views
+        segments = []
+        position = start
+        while position < stop:
+            index = position % self.capacity
+            end = min(index + stop - position, self.capacity)
+            segments.append((
+                times[index:end],
+                {field: column[index:end] for field, column in columns.items()},
+            ))
+            position += end - index
+        return Window(start, stop, segments)
+
+    def since(self, timestamp):
+        "The window of the records from timestamp on"
+        low, high = self.first, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.times[middle % self.capacity] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return self.window(low)
+
+    def intact(self, window):
+        "Whether the records in window remain unchanged"
+        # the producer may be overwriting the record after the last
+        #  published, which is the oldest retained
+        return window.start > self.count - self.capacity
+
+
+class TelemetryStore(dict):
+    """
+    Rings of recent replies keyed by reply class and port, each
+    created (with capacity records) when the first reply of its kind
+    is appended.
+    """
+
+    def __init__(self, capacity=100_000):
+        self.capacity = capacity
+
+    def append(self, reply, timestamp=None):
+        key = type(reply), reply.port
+        ring = self.get(key)
+        if ring is None:
+            ring = self[key] = Ring(type(reply), self.capacity)
+        ring.append(reply, timestamp)
+
+    def on_sample(self, sample):
+        "Record a sample from a SensorPoller (for use as its callback)"
+        self.append(sample.values, sample.time)
@@ -0,0 +1,103 @@
+import asyncio
+import socket
+import struct
+
+from jaraco.nxt import aio
+from jaraco.nxt.messages import (
+    BatteryResponse,
+    FrameDecoder,
+    GetBatteryLevel,
+    GetInputValues,
+    InputValues,
+    OutputPort,
+    SetOutputState,
+)
+
+
+def reply(payload):
+    "Reply to a command payload as a brick would"
+    command = payload[1]
+    if command == GetBatteryLevel.command:
+        telegram = struct.pack('<BH', 0, 7000 + len(payload))
+    else:
+        port = payload[2]
+        telegram = struct.pack('<BBBBBBHHhh', 0, port, 1, 0, 1, 0x20, 0, 0, port, 0)
+    body = bytes([2, command]) + telegram
+    return struct.pack('<H', len(body)) + body
+
+
+async def serve_brick(sock, count):
+    """
+    Reply to count requests, answering all input value requests
+    before any battery requests.
+    """
+    loop = asyncio.get_running_loop()
+    decoder = FrameDecoder()
+    requests = []
+    while len(requests) < count:
+        decoder.feed(await loop.sock_recv(sock, 1024))
+        requests.extend(
+            payload for payload in decoder.payloads() if not payload[0] & 0x80
+        )
+    requests.sort(key=lambda payload: payload[1] == GetBatteryLevel.command)
+    for payload in requests:
+        await loop.sock_sendall(sock, reply(payload))
+
+
+async def pipelined_requests():
+    client, brick = socket.socketpair()
+    brick.setblocking(False)
+    device = await aio.connect_socket(client)
+    commands = [
+        GetBatteryLevel(),
+        GetInputValues(1),
+        SetOutputState(OutputPort.a),
+        GetInputValues(3),
+        GetBatteryLevel(),
+    ]
+    server = asyncio.create_task(serve_brick(brick, 4))
+    replies = await asyncio.gather(*map(device.request, commands))
+    await server
+    device.close()
+    brick.close()
+    return replies
+
+
+def test_pipelined_requests():
+    replies = asyncio.run(pipelined_requests())
+    battery1, input1, none, input3, battery2 = replies
+    assert none is None
+    assert isinstance(battery1, BatteryResponse)
+    assert isinstance(battery2, BatteryResponse)
+    assert isinstance(input1, InputValues)
+    assert (input1.port, input3.port) == (0, 2)
+
+
+async def request_after_timeout():
+    client, brick = socket.socketpair()
+    brick.setblocking(False)
+    device = await aio.connect_socket(client)
+    loop = asyncio.get_running_loop()
+    try:
+        await asyncio.wait_for(device.request(GetBatteryLevel()), 0.01)
+    except asyncio.TimeoutError:
+        pass
+    request = asyncio.ensure_future(device.request(GetBatteryLevel()))
+    # the brick never answers the first request, only the second
+    decoder = FrameDecoder()
+    payloads = []
+    while len(payloads) < 2:
+        decoder.feed(await loop.sock_recv(brick, 1024))
+        payloads.extend(decoder.payloads())
+    await loop.sock_sendall(brick, reply(payloads[1]))
+    result = await asyncio.wait_for(request, 1)
+    pending = sum(map(len, device._pending.values()))
+    device.close()
+    brick.close()
+    return result, pending
+
+
+def test_request_after_timeout():
+    result, pending = asyncio.run(request_after_timeout())
+    assert isinstance(result, BatteryResponse)
+    assert not pending
@@ -0,0 +1,21 @@
+import json
+
+from jaraco.nxt import benchmark
+
+
+def test_quick_run_and_compare(tmp_path, capsys):
+    baseline = tmp_path / 'baseline.json'
+    assert benchmark.main(['--quick', '--output', str(baseline)]) == 0
+    results = json.loads(baseline.read_text(encoding='utf-8'))
+    assert results['results']['decode.OutputState']['unit'] == 'us'
+    assert results['results']['socket.request_many']['value'] > 0
+
+    # a baseline that is much faster reports a regression
+    for result in results['results'].values():
+        if benchmark.higher_is_better(result['unit']):
+            result['value'] *= 100
+        else:
+            result['value'] /= 100
+    baseline.write_text(json.dumps(results), encoding='utf-8')
+    assert benchmark.main(['--quick', '--compare', str(baseline)]) == 1
+    assert 'Regression: socket.request' in capsys.readouterr().err
@@ -0,0 +1,126 @@
+import time
+
+from jaraco.nxt.capture import (
+    RECEIVED,
+    SENT,
+    CaptureReader,
+    CaptureWriter,
+    Recorder,
+    ReplayDevice,
+    read_records,
+)
+from jaraco.nxt.messages import (
+    BatteryResponse,
+    GetBatteryLevel,
+    GetInputValues,
+    GetOutputState,
+    InputPort,
+    LSWrite,
+    MessageRead,
+    MessageWrite,
+    OutputPort,
+    RunState,
+    SetOutputState,
+    StartProgram,
+)
+from jaraco.nxt.simulator import Simulator
+
+
+def test_record_and_replay(tmp_path):
+    path = tmp_path / 'capture.nxtcap'
+    commands = [GetOutputState(port) for port in range(3)] + [GetBatteryLevel()]
+    with Simulator(latency=0.02) as sim:
+        with Recorder(sim.connect(), CaptureWriter(path)) as dev:
+            with dev.coalesce(latency=None):
+                originals = dev.request_many(commands)
+            time.sleep(0.05)
+            originals.append(dev.request(GetBatteryLevel()))
+
+    records = list(read_records(path))
+    assert [record.direction for record in records] == [SENT] * 4 + [RECEIVED] * 4 + [
+        SENT,
+        RECEIVED,
+    ]
+    # the coalesced commands were written together
+    assert len({record.timestamp for record in records[:4]}) == 1
+
+    replay = ReplayDevice(path, speed=1)
+    start = time.monotonic()
+    replayed = [replay.receive() for _ in originals]
+    assert time.monotonic() - start >= 0.04
+    assert [msg.payload for msg in replayed] == [msg.payload for msg in originals]
+
+    fast = ReplayDevice(path)
+    assert [type(fast.receive()) for _ in originals] == list(map(type, originals))
+
+
+def test_indexed_reader(tmp_path):
+    path = tmp_path / 'capture.nxtcap'
+    writer = CaptureWriter(path)
+    battery = bytes(GetBatteryLevel())
+    state = bytes(GetOutputState(OutputPort.b))
+    reply = b'\x05\x00\x02\x0b\x00\x78\x1e'
+    for n in range(100):
+        writer.write(SENT, state if n % 2 else battery, timestamp=n)
+        writer.write(RECEIVED, reply, timestamp=n)
+    writer.close()
+
+    with CaptureReader(path, stride=16) as reader:
+        assert len(reader) == 200
+        assert reader[2].timestamp == 1
+        assert reader[2].decode().port == OutputPort.b
+        window = list(reader.frames(start=40, end=45, direction=SENT))
+        assert [frame.timestamp for frame in window] == list(range(40, 45))
+        matches = list(reader.frames(command=GetOutputState.command, start=90))
+        assert [frame.timestamp for frame in matches] == [91, 93, 95, 97, 99]
+        assert isinstance(reader[1].decode(), BatteryResponse)
+        del window, matches
+
+    # the index is persisted and extended with records appended later
+    assert (tmp_path / 'capture.nxtcap.idx').exists()
+    writer = CaptureWriter(path)
+    writer.write(SENT, battery, timestamp=100)
+    writer.close()
+    with CaptureReader(path, stride=16) as reader:
+        assert len(reader) == 201
+        assert reader[-1].timestamp == 100
+
+
+def test_decode_sent_commands(tmp_path, caplog):
+    path = tmp_path / 'capture.nxtcap'
+    commands = [
+        SetOutputState(
+            OutputPort.c,
+            set_power=-40,
+            motor_on=True,
+            use_brake=True,
+            run_state=RunState.running,
+            tacho_limit=360,
+        ),
+        StartProgram('demo.rxe'),
+        MessageRead(3, remove=False),
+        MessageWrite('hello', box_number=2),
+        GetInputValues(2),
+        LSWrite(4, b'\x02\x42', 1),
+    ]
+    writer = CaptureWriter(path)
+    for command in commands:
+        writer.write(SENT, bytes(command))
+    writer.close()
+
+    with CaptureReader(path) as reader:
+        decoded = [frame.decode() for frame in reader]
+    assert [type(msg) for msg in decoded] == list(map(type, commands))
+    assert list(map(bytes, decoded)) == list(map(bytes, commands))
+    state, program, read, write, values, ls_write = decoded
+    assert (state.motor_on, state.use_brake, state.use_regulation) == (
+        True,
+        True,
+        False,
+    )
+    assert program.filename == 'demo.rxe'
+    assert (read.box_number, read.remove) == (3, False)
+    assert (write.message, write.box_number) == (b'hello', 2)
+    assert values.port is InputPort(2)
+    assert ls_write.data == b'\x02\x42'
+    assert not caplog.records
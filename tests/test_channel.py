@@ -0,0 +1,51 @@
+import multiprocessing
+import struct
+
+from jaraco.nxt.channel import Publisher, Subscriber
+from jaraco.nxt.messages import OutputState
+
+
+def output_state(tacho_count):
+    values = (0, 1, 75, 1, 0, 0, 0x20, 0, tacho_count, 0, 0)
+    return OutputState(b'\x02\x06' + struct.pack('<BBbBBbBLlll', *values))
+
+
+def test_overrun():
+    with Publisher(OutputState, capacity=16) as publisher:
+        with Subscriber(publisher.name) as subscriber:
+            publisher.publish(output_state(1), timestamp=1)
+            (record,) = subscriber.poll()
+            assert (record.sequence, record.timestamp) == (0, 1)
+            assert record.reply.tacho_count == 1
+            for count in range(40):
+                publisher.publish(output_state(count))
+            records = subscriber.poll()
+            assert subscriber.lost == 24
+            assert [record.reply.tacho_count for record in records] == list(
+                range(24, 40)
+            )
+            assert subscriber.poll() == []
+        with Subscriber(publisher.name, replay=True) as late:
+            assert len(late.poll()) == 16
+
+
+def consume(name, count, results):
+    with Subscriber(name, replay=True) as subscriber:
+        seen = []
+        while len(seen) + subscriber.lost < count:
+            seen += (record.reply.tacho_count for record in subscriber.poll())
+        results.put((seen, subscriber.lost))
+
+
+def test_other_process():
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    with Publisher(OutputState, capacity=1024) as publisher:
+        consumer = context.Process(target=consume, args=(publisher.name, 500, results))
+        consumer.start()
+        for count in range(500):
+            publisher.publish(output_state(count))
+        seen, lost = results.get(timeout=30)
+        consumer.join()
+    assert lost == 0
+    assert seen == list(range(500))
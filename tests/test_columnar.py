@@ -0,0 +1,61 @@
+import pytest
+
+from jaraco.nxt import messages
+from jaraco.nxt.capture import CaptureReader, CaptureWriter, Recorder
+from jaraco.nxt.simulator import Simulator
+
+np = pytest.importorskip('numpy')
+columnar = pytest.importorskip('jaraco.nxt.columnar')
+
+
+@pytest.mark.parametrize(
+    'cls',
+    [
+        messages.OutputState,
+        messages.InputValues,
+        messages.SleepTimeout,
+        messages.LSReadResponse,
+        messages.MessageReadResponse,
+    ],
+)
+def test_matches_parse(cls):
+    size = cls._struct.size
+    payloads = [
+        bytes([messages.CommandTypes.reply, columnar.command_for(cls)])
+        # (avoiding null bytes, which numpy strips from the end of strings)
+        + bytes((n * 37 + offset) % 255 + 1 for offset in range(size))
+        for n in range(5)
+    ]
+    batch = columnar.decode(cls, b''.join(bytes(cls(p)) for p in payloads))
+    names = batch.dtype.names
+    for record, payload in zip(batch, payloads):
+        reply = cls(payload)
+        for field in cls.fields:
+            value = record[field]
+            if f'{field}_length' in names:
+                # a Pascal string, whose length is limited by its space
+                value = value[: record[f'{field}_length']]
+            assert value == getattr(reply, field)
+
+
+def test_rejects_other_frames():
+    frames = bytes(messages.BatteryResponse(b'\x02\x0b\x00\x78\x1e'))
+    with pytest.raises(ValueError):
+        columnar.decode(messages.SleepTimeout, frames + bytes(2))
+
+
+def test_from_capture(tmp_path):
+    path = tmp_path / 'capture.nxtcap'
+    sim = Simulator()
+    sim.brick.inputs[1].raw = 300  # port 2
+    with sim, Recorder(sim.connect(), CaptureWriter(path)) as dev:
+        for port in range(1, 5):
+            dev.request(messages.GetInputValues(port))
+        dev.request(messages.GetBatteryLevel())
+
+    with CaptureReader(path) as reader:
+        timestamps, values = columnar.from_capture(reader, messages.InputValues)
+        assert np.all(np.diff(timestamps) >= 0)
+        assert values['port'].tolist() == [0, 1, 2, 3]
+        assert values['value'].tolist() == [1023, 300, 1023, 1023]
+        del values
@@ -0,0 +1,43 @@
+from collections import defaultdict
+
+from jaraco.nxt import Device
+from jaraco.nxt.controller import MotorController
+
+
+class RecordingDevice(Device):
+    def __init__(self):
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(bytes(data))
+
+
+def make_controller():
+    controller = MotorController.__new__(MotorController)
+    controller.conn = RecordingDevice()
+    controller.control_rate = 50
+    controller.controller_state = defaultdict(lambda: 0)
+    controller.sent_powers = {}
+    return controller
+
+
+def test_tick_sends_only_changes():
+    controller = make_controller()
+    for value in (0.1, 0.4, 0.45, 0.5):
+        controller.on_axis('l_thumb_y', value)
+    assert controller.conn.writes == []
+
+    controller.tick()
+    # one write carrying a command for each of the three ports
+    (write,) = controller.conn.writes
+    assert len(write) == 3 * 14
+    assert controller.sent_powers[1] == 100
+
+    # too small a change to alter the power sent
+    controller.on_axis('r_thumb_y', 0.0001)
+    controller.tick()
+    assert len(controller.conn.writes) == 1
+
+    controller.on_axis('r_thumb_y', -0.5)
+    controller.tick()
+    assert len(controller.conn.writes[1]) == 14
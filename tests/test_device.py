@@ -0,0 +1,69 @@
+import io
+import struct
+import time
+
+from jaraco.nxt import Device
+from jaraco.nxt.messages import (
+    GetBatteryLevel,
+    GetInputValues,
+    OutputPort,
+    RunState,
+    SetOutputState,
+    StartProgram,
+)
+
+
+class BufferDevice(Device):
+    def __init__(self, incoming=b''):
+        self.incoming = io.BytesIO(incoming)
+        self.outgoing = io.BytesIO()
+
+    def read(self, nbytes):
+        return self.incoming.read(nbytes)
+
+    def write(self, data):
+        self.outgoing.write(data)
+
+
+def test_send_writes_frames():
+    dev = BufferDevice()
+    commands = [
+        SetOutputState(
+            OutputPort.b, motor_on=True, set_power=75, run_state=RunState.running
+        ),
+        GetBatteryLevel(),
+        StartProgram('prog.rxe'),
+    ]
+    for command in commands:
+        dev.send(command)
+    expected = b''.join(bytes(command) for command in commands)
+    assert dev.outgoing.getvalue() == expected
+    assert expected.startswith(b'\x0c\x00\x80\x04\x01\x4b\x01')
+
+
+def test_request_many():
+    battery = b'\x02\x0b\x00' + struct.pack('<H', 7400)
+    inputs = b'\x02\x07' + struct.pack('<BBBBBBHHhh', 0, 1, 1, 0, 1, 0x20, 0, 0, 1, 0)
+    incoming = b''.join(
+        struct.pack('<H', len(payload)) + payload for payload in (battery, inputs)
+    )
+    dev = BufferDevice(incoming)
+    commands = [GetBatteryLevel(), SetOutputState(OutputPort.a), GetInputValues(2)]
+    battery_reply, none, input_reply = dev.request_many(commands)
+    assert battery_reply.millivolts == 7400
+    assert none is None
+    assert input_reply.scaled_value == 1
+    assert dev.outgoing.getvalue() == b''.join(map(bytes, commands))
+
+
+def test_coalesce_latency():
+    dev = BufferDevice()
+    writer = dev.coalesce(latency=0.005)
+    dev.send(GetBatteryLevel())
+    dev.send(GetBatteryLevel())
+    deadline = time.monotonic() + 5
+    while not dev.outgoing.getvalue() and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert dev.outgoing.getvalue() == bytes(GetBatteryLevel()) * 2
+    writer.close()
+    assert dev._writer is None
@@ -0,0 +1,129 @@
+import io
+import struct
+import time
+
+import pytest
+
+from jaraco.nxt import ConcurrentLocator, Device, DeviceNotFoundException
+from jaraco.nxt.cache import BrickCache
+
+battery_reply = struct.pack('<HBBBH', 5, 2, 0x0B, 0, 7200)
+
+
+class FakeBrick(Device):
+    transport = 'serial'
+
+    def __init__(self, name, reply=battery_reply):
+        self.name = self.address = name
+        self.incoming = io.BytesIO(reply)
+        self.closed = False
+
+    def read(self, nbytes):
+        return self.incoming.read(nbytes)
+
+    def write(self, data):
+        pass
+
+    def set_timeout(self, timeout):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class FakeLocator(ConcurrentLocator):
+    def __init__(self, bluetooth, serial, cache=None):
+        super().__init__(cache)
+        self.bluetooth = bluetooth
+        self.serial = serial
+        self.opened = []
+
+    def bluetooth_openers(self, timeout=None):
+        time.sleep(0.05)
+        return map(self._opener, self.bluetooth)
+
+    def serial_openers(self, timeout=None):
+        return map(self._opener, self.serial)
+
+    def _opener(self, spec):
+        name, delay, reply = spec
+
+        def open():
+            time.sleep(delay)
+            if reply is None:
+                raise IOError(f"{name} not available")
+            brick = FakeBrick(name, reply)
+            self.opened.append(brick)
+            return brick
+
+        return open
+
+    def _open_entry(self, entry):
+        specs = {spec[0]: spec for spec in self.serial}
+        return self._opener(specs[entry['address']])()
+
+
+def test_first_responder_wins():
+    locator = FakeLocator(
+        bluetooth=[('bt-fast', 0, battery_reply)],
+        serial=[('com-missing', 0, None), ('com-slow', 0.5, battery_reply)],
+    )
+    start = time.monotonic()
+    brick = locator.find_brick()
+    assert brick.name == 'bt-fast'
+    assert time.monotonic() - start < 0.45
+    time.sleep(0.6)
+    # the slow candidate was closed when it finally opened
+    (slow,) = (dev for dev in locator.opened if dev.name == 'com-slow')
+    assert slow.closed
+    assert not brick.closed
+
+
+def test_silent_candidates_are_closed():
+    locator = FakeLocator(bluetooth=[], serial=[('com-silent', 0, b'')])
+    with pytest.raises(DeviceNotFoundException):
+        locator.find_brick()
+    (silent,) = locator.opened
+    assert silent.closed
+
+
+def test_timeout():
+    locator = FakeLocator(bluetooth=[], serial=[('com-slow', 1, battery_reply)])
+    with pytest.raises(DeviceNotFoundException):
+        locator.find_brick(timeout=0.1)
+
+
+def test_cached_brick_first(tmp_path):
+    cache = BrickCache(tmp_path / 'bricks.json')
+    serial = [('com-slow', 0.3, battery_reply)]
+    first = FakeLocator(bluetooth=[], serial=serial, cache=cache).find_brick()
+    assert first.name == 'com-slow'
+
+    # a cache hit doesn't wait on discovery or the other candidates
+    serial.insert(0, ('com-fast', 0, battery_reply))
+    locator = FakeLocator(bluetooth=[], serial=serial, cache=cache)
+    assert locator.find_brick().name == 'com-slow'
+
+    # a cached brick that doesn't respond is forgotten
+    serial[1] = ('com-slow', 0, b'')
+    locator = FakeLocator(bluetooth=[], serial=serial, cache=cache)
+    assert locator.find_brick().name == 'com-fast'
+    assert [entry['address'] for entry in cache.entries()] == ['com-fast']
+
+
+@pytest.mark.parametrize(
+    'content',
+    [
+        '{"transport": "serial"}',
+        '[{"transport": "serial", "address": "com-gone"}, 5, null]',
+        '[{"address": "com-gone", "last_seen": 1e12}]',
+        'not json',
+    ],
+)
+def test_malformed_cache_ignored(tmp_path, content):
+    cache = BrickCache(tmp_path / 'bricks.json')
+    cache.path.write_text(content, encoding='utf-8')
+    assert cache.entries() == []
+    serial = [('com-fast', 0, battery_reply)]
+    locator = FakeLocator(bluetooth=[], serial=serial, cache=cache)
+    assert locator.find_brick().name == 'com-fast'
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from jaraco.nxt import Device
+from jaraco.nxt.messages import GetBatteryLevel, GetOutputState, OutputPort
+from jaraco.nxt.metrics import Snapshot
+from jaraco.nxt.simulator import Simulator
+
+
+def test_snapshot_of_device():
+    snap = Snapshot()
+    events = []
+    with Simulator(latency=0.01) as sim:
+        dev = sim.connect()
+        dev.instrument(lambda event: (snap(event), events.append(event)))
+        dev.request_many([GetBatteryLevel(), GetOutputState(OutputPort.a)])
+        dev.request(GetBatteryLevel())
+        dev.set_timeout(0.001)
+        with pytest.raises(TimeoutError):
+            dev.receive()
+    stats = snap.snapshot()
+    assert stats['counts']['sent'] == {'GetBatteryLevel': 2, 'GetOutputState': 1}
+    assert stats['counts']['received'] == {'BatteryResponse': 2, 'OutputState': 1}
+    assert stats['bytes'] == {'sent': 4 + 5 + 4, 'received': 7 + 27 + 7}
+    assert stats['counts']['error'] == {'TimeoutError': 1}
+    round_trips = stats['durations']['round_trip']
+    assert round_trips['GetBatteryLevel']['count'] == 2
+    assert round_trips['GetOutputState']['mean'] >= 0.01
+    assert {event.kind for event in events} >= {'read_wait', 'decode'}
+
+
+class UnreliableDevice(Device):
+    "A device answering each battery request unless told to drop it"
+
+    drop = False
+
+    def __init__(self):
+        self.incoming = bytearray()
+
+    def read(self, nbytes):
+        if not self.incoming:
+            raise TimeoutError()
+        data = bytes(self.incoming[:nbytes])
+        del self.incoming[:nbytes]
+        return data
+
+    def write(self, data):
+        if not self.drop:
+            self.incoming += b'\x05\x00\x02\x0b\x00\x78\x1e'
+
+
+def test_round_trip_after_timeout():
+    snap = Snapshot()
+    dev = UnreliableDevice()
+    dev.instrument(snap)
+    dev.drop = True
+    with pytest.raises(TimeoutError):
+        dev.request(GetBatteryLevel())
+    time.sleep(0.05)
+    dev.drop = False
+    dev.request(GetBatteryLevel())
+    round_trip = snap.snapshot()['durations']['round_trip']['GetBatteryLevel']
+    assert round_trip['count'] == 1
+    assert round_trip['max'] < 0.05
@@ -2,7 +2,10 @@ import struct
 import logging
 import io
 
-from jaraco.nxt.messages import Message, BatteryResponse
+import pytest
+
+from jaraco.nxt import messages
+from jaraco.nxt.messages import Message, BatteryResponse, OutputState
 
 
 logging.basicConfig(level=logging.DEBUG)
@@ -17,6 +20,109 @@ def test_sample_battery_message():
     assert isinstance(msg, BatteryResponse), type(msg)
 
 
+def test_output_state_fields():
+    values = (0, 1, -75, 1, 0, 0, 0x20, 360, -120, -120, 0)
+    payload = b'\x02\x06' + struct.pack('<BBbBBbBLlll', *values)
+    msg = OutputState(payload)
+    assert tuple(getattr(msg, field) for field in msg.fields) == values
+
+
+def test_fields_decoded_when_read():
+    values = (0, 1, -75, 1, 0, 0, 0x20, 360, -120, -120, 0)
+    payload = memoryview(b'\x02\x06' + struct.pack('<BBbBBbBLlll', *values))
+    msg = OutputState(payload)
+    assert msg.run_state == 0x20
+    assert not hasattr(msg, '_tacho_count')
+    msg.tacho_count = 5
+    assert msg.tacho_count == 5
+
+
+@pytest.mark.parametrize(
+    'cls', sorted(set(Message._messages.values()), key=lambda cls: cls.__name__)
+)
+def test_no_instance_dict(cls):
+    for each in cls, cls.expected_reply or Message:
+        assert not each.__dictoffset__, f"{each.__name__} instances have a __dict__"
+
+
+def test_slotted_command():
+    msg = messages.SetOutputState(messages.OutputPort.a, set_power=50, motor_on=True)
+    assert not hasattr(msg, '__dict__')
+    with pytest.raises(AttributeError):
+        msg.unknown = 1
+
+
+class LabeledOutputState(messages.SetOutputState):
+    def __init__(self, label, *args, **kwargs):
+        self.label = label
+        super().__init__(*args, **kwargs)
+
+
+def test_subclass_elsewhere_not_slotted():
+    msg = LabeledOutputState('left', messages.OutputPort.a, set_power=50)
+    msg.note = 'extra'
+    assert msg.label == 'left'
+    assert bytes(msg) == bytes(messages.SetOutputState(messages.OutputPort.a, 50))
+
+
+command_samples = {
+    messages.StartProgram: ('prog.rxe',),
+    messages.SetOutputState: (messages.OutputPort.b, 75, True, False, True),
+    messages.PlaySoundFile: (False, b'sound.rso'),
+    messages.SetInputMode: (1, messages.SensorType.switch, messages.SensorMode.boolean),
+    messages.GetOutputState: (messages.OutputPort.c,),
+    messages.ResetInputScaledValue: (2,),
+    messages.GetInputValues: (3,),
+    messages.GetVersion: (),
+    messages.GetInfo: (),
+    messages.GetBatteryLevel: (),
+    messages.PlayTone: (440, 200),
+    messages.GetCurrentProgramName: (),
+    messages.KeepAlive: (),
+    messages.MessageWrite: ('hello', 3),
+    messages.ResetMotorPosition: (messages.OutputPort.a, False),
+    messages.StopSoundPlayback: (),
+    messages.LSGetStatus: (4,),
+    messages.LSWrite: (1, b'\x02\x42', 1),
+    messages.LSRead: (2,),
+    messages.MessageRead: (2, False),
+}
+
+
+def test_command_samples_complete():
+    commands = {
+        cls
+        for cls in messages.Message._messages.values()
+        if issubclass(cls, messages.Command)
+    }
+    assert commands == set(command_samples)
+
+
+@pytest.mark.parametrize('cls', command_samples, ids=lambda cls: cls.__name__)
+def test_fast_encodes_as_validated(cls):
+    args = command_samples[cls]
+    assert bytes(cls.fast(*args)) == bytes(cls(*args))
+
+
+@pytest.mark.parametrize('cls', command_samples, ids=lambda cls: cls.__name__)
+def test_command_from_payload(cls):
+    command = cls(*command_samples[cls])
+    assert bytes(cls.from_payload(command.payload)) == bytes(command)
+
+
+class TrickleStream(io.BytesIO):
+    "A stream that returns at most one byte per read"
+
+    def read(self, size=-1):
+        return super().read(min(size, 1))
+
+
+def test_read_short_reads():
+    frame = b'\x05\x00\x02\x0b\x00\x50\x00'
+    msg = Message.read(TrickleStream(frame))
+    assert msg.millivolts == 0x50
+
+
 def run():
     test_sample_battery_message()
 
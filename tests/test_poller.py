@@ -0,0 +1,75 @@
+import pytest
+
+from jaraco.nxt import messages
+from jaraco.nxt.messages import InputPort, SensorMode, SensorType
+from jaraco.nxt.poller import SensorPoller
+from jaraco.nxt.simulator import Simulator
+
+
+class FakeClock:
+    "A clock that advances only when slept"
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_rates_and_budget():
+    clock = FakeClock()
+    touch, light = InputPort(2), InputPort(3)
+    with Simulator() as sim:
+        sim.brick.inputs[1].raw = 100
+        poller = SensorPoller(sim.connect(), clock=clock, sleep=clock.sleep)
+        touched = []
+        poller.subscribe(
+            touch,
+            SensorType.switch,
+            SensorMode.boolean,
+            rate=100,
+            callback=touched.append,
+        )
+        poller.subscribe(light, SensorType.light_active, SensorMode.raw, rate=10)
+        samples = []
+        while clock() < 1:
+            samples += poller.poll()
+        # samples in the first second (less rounding in the deadlines)
+        first = [sample for sample in samples if sample.time < 0.999]
+        assert sum(sample.port == touch for sample in first) == 100
+        assert sum(sample.port == light for sample in first) == 10
+        assert touched == [sample for sample in samples if sample.port == touch]
+        assert all(sample.values.scaled_value == 1 for sample in touched)
+        # each sensor was configured once
+        assert sim.brick.log.count(messages.SetInputMode) == 2
+
+        poller.budget = 55
+        samples = []
+        while clock() < 3:
+            samples += poller.poll()
+        assert 50 <= sum(2 <= sample.time < 2.999 for sample in samples) <= 55
+
+
+def test_stop():
+    with Simulator() as sim:
+        poller = SensorPoller(sim.connect())
+        poller.subscribe(
+            1,
+            SensorType.switch,
+            SensorMode.boolean,
+            rate=1000,
+            callback=lambda sample: poller.stop(),
+        )
+        poller.run()
+        assert poller.subscriptions
+
+
+@pytest.mark.parametrize('rate', [0, -5])
+def test_rate_must_be_positive(rate):
+    poller = SensorPoller(device=None)
+    with pytest.raises(ValueError):
+        poller.subscribe(1, SensorType.switch, SensorMode.boolean, rate=rate)
+    assert not poller.subscriptions
@@ -0,0 +1,58 @@
+import time
+
+from jaraco.nxt.messages import GetBatteryLevel, OutputPort, SetOutputState
+from jaraco.nxt.pool import BrickPool
+
+
+class SlowBrick:
+    "A device taking a fixed time to reply"
+
+    def __init__(self, millivolts, delay=0.2):
+        self.millivolts = millivolts
+        self.delay = delay
+        self.requests = []
+        self.closed = False
+
+    def request(self, command):
+        self.requests.append(command)
+        time.sleep(self.delay)
+        return self.millivolts
+
+    def close(self):
+        self.closed = True
+
+
+def test_broadcast_in_parallel():
+    bricks = {f'nxt{n}': SlowBrick(7000 + n) for n in range(10)}
+    with BrickPool(bricks) as pool:
+        start = time.monotonic()
+        replies = dict(pool.broadcast(GetBatteryLevel()))
+        elapsed = time.monotonic() - start
+    assert replies == {key: brick.millivolts for key, brick in bricks.items()}
+    assert elapsed < 1
+    assert all(brick.closed for brick in bricks.values())
+
+
+def test_gather_in_completion_order():
+    pool = BrickPool(dict(slow=SlowBrick(1, delay=0.3), fast=SlowBrick(2, delay=0)))
+    commands = dict(
+        slow=SetOutputState(OutputPort.a), fast=SetOutputState(OutputPort.b)
+    )
+    assert [key for key, reply in pool.gather(commands)] == ['fast', 'slow']
+    assert pool['fast'].requests == [commands['fast']]
+    pool.close()
+
+
+class BrokenBrick(SlowBrick):
+    def request(self, command):
+        raise ConnectionError("Brick disconnected")
+
+
+def test_broadcast_with_failures():
+    bricks = dict(good=SlowBrick(7000, delay=0), bad=BrokenBrick(0))
+    bricks['slow'] = SlowBrick(7100, delay=0.5)
+    with BrickPool(bricks) as pool:
+        results = dict(pool.broadcast(GetBatteryLevel(), timeout=0.2))
+    assert results['good'] == 7000
+    assert isinstance(results['bad'], ConnectionError)
+    assert isinstance(results['slow'], TimeoutError)
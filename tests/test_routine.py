@@ -0,0 +1,105 @@
+import time
+
+import pytest
+
+from jaraco.nxt import messages, routine
+from jaraco.nxt.messages import OutputPort, RunState, SetOutputState
+from jaraco.nxt.simulator import Simulator
+
+
+def start(device, port, tacho_limit, power=100):
+    device.send(
+        SetOutputState(
+            port,
+            set_power=power,
+            motor_on=True,
+            run_state=RunState.running,
+            tacho_limit=tacho_limit,
+        )
+    )
+
+
+def test_await_motion():
+    with Simulator() as sim:
+        device = sim.connect()
+        start(device, OutputPort.b, 270)
+        start(device, OutputPort.c, 180)
+        began = time.monotonic()
+        states = routine.await_motion(device, [OutputPort.b, 'c'])
+        elapsed = time.monotonic() - began
+    assert set(states) == {OutputPort.b, OutputPort.c}
+    assert states[OutputPort.b].tacho_count == 270
+    # 270 degrees at 900 degrees per second
+    assert 0.3 <= elapsed < 0.4
+    # far fewer polls than at a fixed 10 ms interval
+    assert sim.brick.log.count(messages.GetOutputState) < 20
+
+
+def test_await_motion_timeout():
+    with Simulator() as sim:
+        device = sim.connect()
+        start(device, OutputPort.a, 0, power=50)
+        with pytest.raises(TimeoutError):
+            routine.await_motion(device, [OutputPort.a], timeout=0.1)
+
+
+def test_motion_sequence(monkeypatch):
+    sequence = routine.MotionSequence()
+    for step in range(5):
+        power = 50 if step % 2 else -50
+        sequence.send(
+            step * 0.02,
+            SetOutputState(OutputPort.a, power, True, run_state=RunState.running),
+            SetOutputState(OutputPort.b, -power, True, run_state=RunState.running),
+        )
+    sequence.send(0.1, SetOutputState(OutputPort.all))
+
+    # the frames were encoded up front
+    monkeypatch.setattr(SetOutputState, 'encode_into', None)
+
+    with Simulator() as sim:
+        device = sim.connect()
+        began = time.monotonic()
+        jitter = sequence.run(device)
+        elapsed = time.monotonic() - began
+        device.request(messages.KeepAlive())
+    assert jitter.count == 6
+    assert 0 <= jitter.worst < 0.02
+    assert 0.1 <= elapsed < 0.15
+    assert sim.brick.log.count(SetOutputState) == 11
+    assert sim.brick.outputs[0].power == 0
+
+
+def test_motion_sequence_rejects_requests():
+    with pytest.raises(ValueError):
+        routine.MotionSequence().send(0, messages.GetOutputState(OutputPort.a))
+
+
+def test_motion_sequence_after_coalesced_and_instrumented():
+    events = []
+    sequence = routine.MotionSequence()
+    sequence.send(0, SetOutputState(OutputPort.a), SetOutputState(OutputPort.b))
+    with Simulator() as sim:
+        device = sim.connect()
+        device.instrument(events.append)
+        device.coalesce(latency=None)
+        device.send(messages.PlayTone(440))
+        sequence.run(device)
+        device.request(messages.KeepAlive())
+    sent = [event for event in events if event.kind == 'sent']
+    expected = [messages.PlayTone, SetOutputState, SetOutputState]
+    assert [event.name for event in sent] == [cls.__name__ for cls in expected] + [
+        'KeepAlive'
+    ]
+    assert sim.brick.log[:3] == expected
+
+
+def test_motion_sequence_join_timeout():
+    sequence = routine.MotionSequence()
+    sequence.send(0.5, SetOutputState(OutputPort.a))
+    with Simulator() as sim:
+        sequence.start(sim.connect())
+        with pytest.raises(TimeoutError):
+            sequence.join(timeout=0.01)
+        sequence.stop()
+        sequence.join()
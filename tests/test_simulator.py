@@ -0,0 +1,121 @@
+import time
+
+import serial
+
+from jaraco.nxt import Connection
+from jaraco.nxt.messages import (
+    GetInputValues,
+    GetOutputState,
+    KeepAlive,
+    LSGetStatus,
+    LSRead,
+    LSWrite,
+    MessageRead,
+    MessageWrite,
+    OutputPort,
+    RunState,
+    SensorMode,
+    SensorType,
+    SetInputMode,
+    SetOutputState,
+)
+from jaraco.nxt.simulator import Brick, Simulator
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_motor_honors_tacho_limit():
+    clock = Clock()
+    with Simulator(Brick(clock)) as sim:
+        dev = sim.connect()
+        dev.send(
+            SetOutputState(
+                OutputPort.b,
+                set_power=50,
+                motor_on=True,
+                run_state=RunState.running,
+                tacho_limit=720,
+            )
+        )
+        assert dev.request(GetOutputState(OutputPort.b)).tacho_count == 0
+        clock.now = 1
+        state = dev.request(GetOutputState(OutputPort.b))
+        assert state.run_state == RunState.running
+        assert state.tacho_count == 450
+        clock.now = 2
+        state = dev.request(GetOutputState(OutputPort.b))
+        assert state.run_state == RunState.idle
+        assert state.tacho_count == 720
+
+
+def test_sensor_and_mailboxes():
+    with Simulator() as sim:
+        dev = sim.connect()
+        dev.send(SetInputMode(2, SensorType.switch, SensorMode.boolean))
+        sim.brick.inputs[1].raw = 183
+        assert dev.request(GetInputValues(2)).scaled_value == 1
+
+        dev.send(MessageWrite('hello', box_number=3))
+        # wait for the brick to process the message
+        dev.request(KeepAlive())
+        assert sim.brick.inbox[2] == [b'hello']
+        sim.brick.outbox[0].append(b'world')
+        assert dev.request(MessageRead(1)).message == b'world'
+        assert dev.request(MessageRead(1)).status == 0x40
+
+        dev.send(LSWrite(1, b'\x02\x42', response_length=6))
+        assert dev.request(LSGetStatus(1)).num_bytes == 6
+        assert dev.request(LSRead(1)).data == bytes(6)
+
+
+def test_latency():
+    with Simulator(latency=0.05, jitter=0.01, seed=1) as sim:
+        dev = sim.connect()
+        start = time.monotonic()
+        replies = dev.request_many(GetInputValues(port) for port in range(1, 5))
+        elapsed = time.monotonic() - start
+    assert [reply.port for reply in replies] == [0, 1, 2, 3]
+    # pipelined requests incur the latency about once
+    assert 0.04 <= elapsed < 0.15
+
+
+def test_pty():
+    with Simulator() as sim:
+        conn = Connection(sim.open_pty(), timeout=1)
+        assert isinstance(conn, serial.Serial)
+        assert conn.request(GetOutputState(OutputPort.c)).port == OutputPort.c
+        conn.close()
+
+
+def test_connections_receive_own_replies():
+    with Simulator(latency=0.01) as sim:
+        first, second = sim.connect(), sim.connect()
+        first.send(GetOutputState(OutputPort.a))
+        second.send(GetOutputState(OutputPort.b))
+        first.send(GetOutputState(OutputPort.a))
+        assert second.receive().port == OutputPort.b
+        assert [first.receive().port for _ in range(2)] == [OutputPort.a] * 2
+
+
+def test_invalid_port_rejected():
+    with Simulator() as sim:
+        dev = sim.connect()
+        assert dev.request(GetOutputState(OutputPort.all)).status == 0xF0
+        assert dev.request(GetOutputState(OutputPort.c)).status == 0
+
+
+def test_close_stops_threads():
+    sim = Simulator(latency=0.01)
+    dev = sim.connect()
+    dev.send(GetOutputState(OutputPort.a))
+    path = sim.open_pty()
+    assert path
+    threads = list(sim._threads)
+    sim.close()
+    assert not any(thread.is_alive() for thread in threads)
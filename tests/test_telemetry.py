@@ -0,0 +1,76 @@
+import struct
+import threading
+
+from jaraco.nxt import messages
+from jaraco.nxt.messages import OutputPort, OutputState
+from jaraco.nxt.poller import SensorPoller
+from jaraco.nxt.simulator import Simulator
+from jaraco.nxt.telemetry import Ring, TelemetryStore
+
+
+def output_state(port, tacho_count):
+    values = (0, port, 75, 1, 0, 0, 0x20, 0, tacho_count, tacho_count, tacho_count)
+    return OutputState(b'\x02\x06' + struct.pack('<BBbBBbBLlll', *values))
+
+
+def test_ring_wraps():
+    ring = Ring(OutputState, capacity=100)
+    for count in range(250):
+        ring.append(output_state(OutputPort.b, -count), timestamp=count / 10)
+    assert len(ring) == 100
+    window = ring.window()
+    assert (window.start, window.stop) == (150, 250)
+    assert window.column('tacho_count').tolist() == list(range(-150, -250, -1))
+    assert ring.since(20).start == 200
+    assert ring.window(240, 245).column('tacho_count').tolist() == [
+        -240,
+        -241,
+        -242,
+        -243,
+        -244,
+    ]
+    assert ring.intact(ring.window(200))
+    stale = ring.window()
+    ring.append(output_state(OutputPort.b, 0))
+    assert not ring.intact(stale)
+
+
+def test_concurrent_readers():
+    ring = Ring(OutputState, capacity=64)
+    done = threading.Event()
+    torn = []
+
+    def read():
+        while not done.is_set():
+            window = ring.window()
+            counts = window.column('tacho_count').tolist()
+            blocks = window.column('block_tacho_count').tolist()
+            if ring.intact(window) and counts != blocks:
+                torn.append(window)
+
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    for reader in readers:
+        reader.start()
+    for count in range(20000):
+        ring.append(output_state(OutputPort.a, count), timestamp=count)
+    done.set()
+    for reader in readers:
+        reader.join()
+    assert not torn
+
+
+def test_poller_samples():
+    store = TelemetryStore(capacity=10)
+    with Simulator() as sim:
+        poller = SensorPoller(sim.connect())
+        poller.subscribe(
+            1,
+            messages.SensorType.switch,
+            messages.SensorMode.boolean,
+            rate=1000,
+            callback=store.on_sample,
+        )
+        poller.run(duration=0.05)
+    ring = store[messages.InputValues, messages.InputPort(1)]
+    assert len(ring) == 10
+    assert set(ring.window().column('value')) == {1023}